@@ -1,2 +1,3 @@
+from .email import OutboxEmailAdmin
 from .oauth2 import OAuth2ClientAdmin
 from .user import UserAdmin
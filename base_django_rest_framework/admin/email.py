@@ -0,0 +1,19 @@
+from django.contrib.admin import ModelAdmin, register, action
+from django.utils import timezone
+
+from base_django_rest_framework.models import OutboxEmail
+
+
+@register(OutboxEmail)
+class OutboxEmailAdmin(ModelAdmin):
+    list_display = ("subject", "to", "status", "attempts", "available_at")
+    list_filter = ("status",)
+    search_fields = ("subject",)
+    readonly_fields = ("id", "subject", "body", "html_body", "from_email", "to", "status", "attempts", "available_at",
+                       "last_error", "created_at")
+    ordering = ("available_at",)
+    actions = ("retry",)
+
+    @action(description="Retry selected emails")
+    def retry(self, request, queryset):
+        queryset.update(status=OutboxEmail.Status.PENDING, attempts=0, available_at=timezone.now())
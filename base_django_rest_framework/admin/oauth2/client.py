@@ -3,6 +3,7 @@ from datetime import datetime
 from django.contrib.admin import SimpleListFilter, ModelAdmin, register, display
 
 from base_django_rest_framework.models import OAuth2Client
+from base_django_rest_framework.pagination import EstimatedCountPaginator
 
 
 class ClientSecretStatusFilter(SimpleListFilter):
@@ -14,7 +15,11 @@ class ClientSecretStatusFilter(SimpleListFilter):
         return ("active", "Active"), ("expired", "Expired")
 
     def queryset(self, request, queryset):
-        return queryset.filter(client_secret_is_expired=self.value() == "expired")
+        if self.value() == "active":
+            return queryset.client_secret_active()
+        if self.value() == "expired":
+            return queryset.client_secret_expired()
+        return queryset
 
 
 @register(OAuth2Client)
@@ -38,10 +43,12 @@ class OAuth2ClientAdmin(ModelAdmin):
     search_fields = ("client_id", "client_name")
     readonly_fields = ("id", "client_id", "client_secret", "client_id_issued_at", "client_secret_expires_at")
     ordering = ("-client_id_issued_at",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     @display(description="client secret is active", boolean=True)
     def client_secret_is_active(self, instance):
-        return not getattr(instance, "client_secret_is_expired")
+        return not instance.is_client_secret_expired()
 
     @display(description="client id issued at")
     def client_id_issued_at_datetime(self, instance):
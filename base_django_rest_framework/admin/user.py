@@ -2,6 +2,8 @@ from django.contrib.admin import register, display
 from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin as _UserAdmin
 
+from base_django_rest_framework.pagination import EstimatedCountPaginator
+
 
 @register(get_user_model())
 class UserAdmin(_UserAdmin):
@@ -27,6 +29,8 @@ class UserAdmin(_UserAdmin):
     search_fields = ("first_name", "last_name", "username", "email")
     readonly_fields = ("id", "created_at", "updated_at", "last_login")
     ordering = ("-created_at",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     @display(description="full name")
     def full_name(self, instance):
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.asgi import get_asgi_application as _get_asgi_application
+
+enabled = False
+
+
+def get_asgi_application():
+    global enabled
+    enabled = True
+    return _get_asgi_application()
+
+
+def is_async_enabled():
+    async_views = getattr(settings, "ASYNC_VIEWS", None)
+    return enabled if async_views is None else async_views
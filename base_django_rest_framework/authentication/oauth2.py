@@ -1,10 +1,97 @@
-from authlib.integrations.django_oauth2 import ResourceProtector, BearerTokenValidator
+from authlib.integrations.django_oauth2 import ResourceProtector, BearerTokenValidator as _BearerTokenValidator
+from authlib.integrations.django_oauth2.requests import DjangoJsonRequest
+from authlib.integrations.django_oauth2.signals import token_authenticated
 from authlib.oauth2 import OAuth2Error
 from authlib.oauth2.rfc6749 import MissingAuthorizationError
+from django.contrib.auth import get_user_model
+from django.core.signing import BadSignature
+from django.db import router
+from django.utils.functional import SimpleLazyObject
 from rest_framework.authentication import BaseAuthentication as _BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 
+from base_django_rest_framework.caches import token_cache, revocation_list
 from base_django_rest_framework.models import OAuth2Token
+from base_django_rest_framework.signing import OAuth2TokenSigner
+
+
+class CachedUser(SimpleLazyObject):
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, pk, is_active):
+        super().__init__(lambda: get_user_model().objects.get(pk=pk))
+        self.__dict__.update({"pk": pk, "id": pk, "is_active": is_active})
+
+    def __bool__(self):
+        return True
+
+
+class BearerTokenValidator(_BearerTokenValidator):
+    def authenticate_token(self, token_string):
+        if OAuth2TokenSigner.is_signed(token_string):
+            claims = self.get_signed_claims(token_string)
+            if claims is None:
+                return None
+            revoked = claims["jti"] in revocation_list
+            is_active = not revoked and token_cache.get_user_is_active(claims["sub"])
+            return self.get_signed_token(token_string, claims, revoked, is_active)
+        entry = token_cache.get(token_string)
+        if entry is not None:
+            return self.get_cached_token(token_string, entry)
+        try:
+            token = self.token_model.objects.select_related("user").get(access_token=token_string)
+        except self.token_model.DoesNotExist:
+            return None
+        token_cache.set(token)
+        return token
+
+    async def aauthenticate_token(self, token_string):
+        if OAuth2TokenSigner.is_signed(token_string):
+            claims = self.get_signed_claims(token_string)
+            if claims is None:
+                return None
+            revoked = await revocation_list.acontains(claims["jti"])
+            is_active = not revoked and await token_cache.aget_user_is_active(claims["sub"])
+            return self.get_signed_token(token_string, claims, revoked, is_active)
+        entry = await token_cache.aget(token_string)
+        if entry is not None:
+            return self.get_cached_token(token_string, entry)
+        try:
+            token = await self.token_model.objects.select_related("user").aget(access_token=token_string)
+        except self.token_model.DoesNotExist:
+            return None
+        await token_cache.aset(token)
+        return token
+
+    def get_signed_claims(self, token_string):
+        try:
+            return OAuth2TokenSigner.unsign(token_string)
+        except BadSignature:
+            return None
+
+    def get_signed_token(self, token_string, claims, revoked, is_active):
+        return self.build_token(token_string, CachedUser(claims["sub"], is_active), {
+            "id": claims["jti"],
+            "client_id": claims["cid"],
+            "token_type": "Bearer",
+            "scope": claims["scope"],
+            "revoked": revoked,
+            "issued_at": claims["iat"],
+            "expires_in": claims["exp"] - claims["iat"] if claims["exp"] else 0,
+            "expires_at": claims["exp"] or None
+        })
+
+    def get_cached_token(self, token_string, entry):
+        entry = entry.copy()
+        return self.build_token(token_string, CachedUser(entry.pop("user_id"), entry.pop("user_is_active")), entry)
+
+    def build_token(self, token_string, user, fields):
+        token = self.token_model(access_token=token_string, user_id=user.pk, **fields)
+        token._state.adding = False
+        token._state.db = router.db_for_read(self.token_model)
+        self.token_model.user.field.set_cached_value(token, user)
+        return token
 
 
 class OAuth2Authentication(_BaseAuthentication, ResourceProtector):
@@ -15,13 +102,36 @@ class OAuth2Authentication(_BaseAuthentication, ResourceProtector):
     def authenticate(self, request):
         try:
             token = self.acquire_token(request)
-            if not token.user.is_active:
-                raise AuthenticationFailed("User inactive or deleted.")
-            return token.user, token
         except MissingAuthorizationError:
             return None
         except OAuth2Error as error:
             raise AuthenticationFailed(detail=error.error, code=error.status_code)
+        return self.authenticate_credentials(token)
+
+    async def aauthenticate(self, request):
+        try:
+            token = await self.aacquire_token(request)
+        except MissingAuthorizationError:
+            return None
+        except OAuth2Error as error:
+            raise AuthenticationFailed(detail=error.error, code=error.status_code)
+        return self.authenticate_credentials(token)
+
+    async def aacquire_token(self, request, scopes=None):
+        req = DjangoJsonRequest(request)
+        if isinstance(scopes, str):
+            scopes = [scopes]
+        validator, token_string = self.parse_request_authorization(req)
+        validator.validate_request(req)
+        token = await validator.aauthenticate_token(token_string)
+        validator.validate_token(token, scopes, req)
+        token_authenticated.send(sender=self.__class__, token=token)
+        return token
+
+    def authenticate_credentials(self, token):
+        if not token.user.is_active:
+            raise AuthenticationFailed("User inactive or deleted.")
+        return token.user, token
 
     def authenticate_header(self, request):
         return "Bearer <token>"
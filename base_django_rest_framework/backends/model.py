@@ -0,0 +1,13 @@
+from django.contrib.auth.backends import ModelBackend
+
+from base_django_rest_framework.caches import permission_cache
+
+
+class CachedModelBackend(ModelBackend):
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, "_perm_cache"):
+            user_obj._perm_cache = permission_cache.get(
+                user_obj.pk, lambda: super(CachedModelBackend, self).get_all_permissions(user_obj))
+        return user_obj._perm_cache
@@ -0,0 +1,5 @@
+from .count import CountCache, count_cache
+from .local import LocalCache
+from .login import LoginGuard, login_guard
+from .oauth2 import OAuth2TokenCache, OAuth2TokenRevocationList, token_cache, revocation_list
+from .permission import PermissionCache, permission_cache
@@ -0,0 +1,85 @@
+import hashlib
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.utils.functional import LazyObject
+from django.utils.module_loading import import_string
+
+
+class CountCache:
+    key_prefix = "counts"
+
+    def __init__(self, cache="default", timeout=60, threshold=100000):
+        self.cache = caches[cache]
+        self.timeout = timeout
+        self.threshold = threshold
+
+    def get_key(self, queryset):
+        sql, params = queryset.order_by().query.sql_with_params()
+        signature = hashlib.sha256(f"{queryset.db}:{sql}:{params!r}".encode()).hexdigest()
+        return f"{self.key_prefix}:{queryset.model._meta.label_lower}:{signature}"
+
+    def get_version_key(self, model):
+        return f"{self.key_prefix}:{model._meta.label_lower}:version"
+
+    def estimate(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        query = queryset.order_by().query
+        with connection.cursor() as cursor:
+            if not query.where and not query.distinct and query.low_mark == 0 and query.high_mark is None:
+                table = connection.ops.quote_name(queryset.model._meta.db_table)
+                cursor.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [table])
+                row = cursor.fetchone()
+                return int(row[0]) if row is not None and row[0] >= 0 else None
+            sql, params = query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def get(self, queryset):
+        key, version_key = self.get_key(queryset), self.get_version_key(queryset.model)
+        entries = self.cache.get_many([key, version_key])
+        version, entry = entries.get(version_key, 0), entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1:]
+        estimate = self.estimate(queryset)
+        if estimate is not None and estimate >= self.threshold:
+            count, estimated = estimate, True
+        else:
+            count, estimated = queryset.count(), False
+        self.cache.set(key, (version, count, estimated), self.timeout)
+        return count, estimated
+
+    async def aget(self, queryset):
+        key, version_key = self.get_key(queryset), self.get_version_key(queryset.model)
+        entries = await self.cache.aget_many([key, version_key])
+        version, entry = entries.get(version_key, 0), entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1:]
+        estimate = await sync_to_async(self.estimate)(queryset)
+        if estimate is not None and estimate >= self.threshold:
+            count, estimated = estimate, True
+        else:
+            count, estimated = await queryset.acount(), False
+        await self.cache.aset(key, (version, count, estimated), self.timeout)
+        return count, estimated
+
+    def invalidate(self, model):
+        self.cache.set(self.get_version_key(model), time.time_ns(), None)
+
+
+class DefaultCountCache(LazyObject):
+    def _setup(self):
+        conf = settings.COUNT_CACHE
+        self._wrapped = import_string(conf["BACKEND"])(**conf.get("OPTIONS", {}))
+
+
+count_cache = DefaultCountCache()
@@ -0,0 +1,69 @@
+import hashlib
+import ipaddress
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.functional import LazyObject
+from django.utils.module_loading import import_string
+
+
+class LoginGuard:
+    key_prefix = "login_guard"
+
+    def __init__(self, cache="default", username_threshold=5, ip_threshold=20, base_delay=1, max_delay=900,
+                 window=3600, ipv4_prefix=32, ipv6_prefix=64):
+        self.cache = caches[cache]
+        self.username_threshold = username_threshold
+        self.ip_threshold = ip_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.window = window
+        self.ipv4_prefix = ipv4_prefix
+        self.ipv6_prefix = ipv6_prefix
+
+    def get_username_key(self, username):
+        return f"{self.key_prefix}:username:{hashlib.sha256(username.casefold().encode()).hexdigest()}"
+
+    def get_ip_key(self, ip):
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return None
+        prefix = self.ipv4_prefix if address.version == 4 else self.ipv6_prefix
+        return f"{self.key_prefix}:ip:{ipaddress.ip_network(f'{address}/{prefix}', strict=False)}"
+
+    def get_keys(self, username, ip):
+        keys = [(self.get_username_key(username), self.username_threshold), (self.get_ip_key(ip), self.ip_threshold)]
+        return [(key, threshold) for key, threshold in keys if key is not None]
+
+    def check(self, username, ip):
+        locks = self.cache.get_many([f"{key}:lock" for key, _ in self.get_keys(username, ip)])
+        return max((math.ceil(until - time.time()) for until in locks.values()), default=0)
+
+    def increment(self, key):
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            return 1 if self.cache.add(key, 1, self.window) else self.cache.incr(key)
+
+    def fail(self, username, ip):
+        for key, threshold in self.get_keys(username, ip):
+            failures = self.increment(key)
+            if failures >= threshold:
+                delay = min(self.base_delay * 2 ** (failures - threshold), self.max_delay)
+                self.cache.set(f"{key}:lock", time.time() + delay, delay)
+
+    def succeed(self, username):
+        key = self.get_username_key(username)
+        self.cache.delete_many([key, f"{key}:lock"])
+
+
+class DefaultLoginGuard(LazyObject):
+    def _setup(self):
+        conf = settings.LOGIN_GUARD
+        self._wrapped = import_string(conf["BACKEND"])(**conf.get("OPTIONS", {}))
+
+
+login_guard = DefaultLoginGuard()
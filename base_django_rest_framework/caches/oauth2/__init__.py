@@ -0,0 +1,2 @@
+from .revocation import OAuth2TokenRevocationList, revocation_list
+from .token import OAuth2TokenCache, token_cache
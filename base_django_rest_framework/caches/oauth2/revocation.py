@@ -0,0 +1,68 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.functional import LazyObject
+from django.utils.module_loading import import_string
+
+
+class OAuth2TokenRevocationList:
+    key_prefix = "oauth2_token_revoked"
+
+    def __init__(self, cache="default", refresh_interval=0, max_local_entries=10000):
+        self.cache = caches[cache]
+        self.refresh_interval = refresh_interval
+        self.max_local_entries = max_local_entries
+        self._local = {}
+
+    def __contains__(self, jti):
+        revoked = self.get_local(jti)
+        if revoked is None:
+            revoked = self.cache.get(self.get_key(jti)) is not None
+            self.set_local(jti, revoked)
+        return revoked
+
+    async def acontains(self, jti):
+        revoked = self.get_local(jti)
+        if revoked is None:
+            revoked = await self.cache.aget(self.get_key(jti)) is not None
+            self.set_local(jti, revoked)
+        return revoked
+
+    def get_key(self, jti):
+        return f"{self.key_prefix}:{jti}"
+
+    def get_local(self, jti):
+        entry = self._local.get(str(jti))
+        if entry is None or time.monotonic() - entry[1] >= self.refresh_interval:
+            return None
+        return entry[0]
+
+    def set_local(self, jti, revoked):
+        if len(self._local) >= self.max_local_entries:
+            self._local = {}
+        self._local[str(jti)] = (revoked, time.monotonic())
+
+    def add(self, *tokens):
+        now = time.time()
+        batches = {}
+        for jti, exp in tokens:
+            if exp and exp <= now:
+                continue
+            timeout = max(int(exp - now) + 1, 1) if exp else None
+            batches.setdefault(timeout, {})[self.get_key(jti)] = True
+            self.set_local(jti, True)
+        for timeout, entries in batches.items():
+            self.cache.set_many(entries, timeout)
+
+    def clear_local(self):
+        self._local = {}
+
+
+class DefaultOAuth2TokenRevocationList(LazyObject):
+    def _setup(self):
+        conf = settings.OAUTH2_TOKEN_REVOCATION_LIST
+        self._wrapped = import_string(conf["BACKEND"])(**conf.get("OPTIONS", {}))
+
+
+revocation_list = DefaultOAuth2TokenRevocationList()
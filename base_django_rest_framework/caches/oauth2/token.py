@@ -0,0 +1,118 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils.functional import LazyObject
+from django.utils.module_loading import import_string
+
+from ..local import LocalCache
+
+
+class OAuth2TokenCache:
+    key_prefix = "oauth2_token"
+    user_key_prefix = "oauth2_token_user_active"
+
+    def __init__(self, cache="default", timeout=300, local_maxsize=1024, local_timeout=0):
+        self.cache = caches[cache]
+        self.timeout = timeout
+        self.local = LocalCache(maxsize=local_maxsize, timeout=local_timeout)
+
+    def get_key(self, access_token):
+        return f"{self.key_prefix}:{hashlib.sha256(access_token.encode()).hexdigest()}"
+
+    def get_user_key(self, user_id):
+        return f"{self.user_key_prefix}:{user_id}"
+
+    def get_timeout(self, entry):
+        if entry["expires_at"] is None:
+            return self.timeout
+        return min(self.timeout, int(entry["expires_at"] - time.time()))
+
+    def get(self, access_token):
+        key = self.get_key(access_token)
+        entry = self.local.get(key)
+        if entry is None:
+            entry = self.cache.get(key)
+            if entry is not None:
+                self.local.set(key, entry, self.get_timeout(entry))
+        return entry
+
+    async def aget(self, access_token):
+        key = self.get_key(access_token)
+        entry = self.local.get(key)
+        if entry is None:
+            entry = await self.cache.aget(key)
+            if entry is not None:
+                self.local.set(key, entry, self.get_timeout(entry))
+        return entry
+
+    def get_entry(self, token):
+        return {
+            "id": token.id,
+            "user_id": token.user_id,
+            "user_is_active": token.user.is_active,
+            "client_id": token.client_id,
+            "token_type": token.token_type,
+            "scope": token.scope,
+            "revoked": token.revoked,
+            "issued_at": int(token.issued_at),
+            "expires_in": token.expires_in,
+            "expires_at": token.expires_at
+        }
+
+    def set(self, token):
+        entry = self.get_entry(token)
+        timeout = self.get_timeout(entry)
+        if timeout > 0:
+            key = self.get_key(token.access_token)
+            self.cache.set(key, entry, timeout)
+            self.local.set(key, entry, timeout)
+        return entry
+
+    async def aset(self, token):
+        entry = self.get_entry(token)
+        timeout = self.get_timeout(entry)
+        if timeout > 0:
+            key = self.get_key(token.access_token)
+            await self.cache.aset(key, entry, timeout)
+            self.local.set(key, entry, timeout)
+        return entry
+
+    def get_user_is_active(self, user_id):
+        key = self.get_user_key(user_id)
+        is_active = self.cache.get(key)
+        if is_active is None:
+            is_active = get_user_model().objects.filter(pk=user_id, is_active=True).exists()
+            self.cache.set(key, is_active, self.timeout)
+        return is_active
+
+    async def aget_user_is_active(self, user_id):
+        key = self.get_user_key(user_id)
+        is_active = await self.cache.aget(key)
+        if is_active is None:
+            is_active = await get_user_model().objects.filter(pk=user_id, is_active=True).aexists()
+            await self.cache.aset(key, is_active, self.timeout)
+        return is_active
+
+    def delete_user(self, user_id):
+        self.cache.delete(self.get_user_key(user_id))
+
+    def delete(self, *access_tokens):
+        keys = [self.get_key(access_token) for access_token in access_tokens]
+        if keys:
+            self.local.delete_many(keys)
+            self.cache.delete_many(keys)
+
+    def clear_local(self):
+        self.local.clear()
+
+
+class DefaultOAuth2TokenCache(LazyObject):
+    def _setup(self):
+        conf = settings.OAUTH2_TOKEN_CACHE
+        self._wrapped = import_string(conf["BACKEND"])(**conf.get("OPTIONS", {}))
+
+
+token_cache = DefaultOAuth2TokenCache()
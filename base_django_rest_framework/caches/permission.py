@@ -0,0 +1,43 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.functional import LazyObject
+from django.utils.module_loading import import_string
+
+
+class PermissionCache:
+    key_prefix = "permissions"
+
+    def __init__(self, cache="default", timeout=3600):
+        self.cache = caches[cache]
+        self.timeout = timeout
+        self.version_key = f"{self.key_prefix}:version"
+
+    def get_key(self, user_id):
+        return f"{self.key_prefix}:{user_id}"
+
+    def get(self, user_id, loader):
+        key = self.get_key(user_id)
+        entries = self.cache.get_many([key, self.version_key])
+        version, entry = entries.get(self.version_key, 0), entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        permissions = loader()
+        self.cache.set(key, (version, permissions), self.timeout)
+        return permissions
+
+    def invalidate(self, *user_ids):
+        self.cache.delete_many([self.get_key(user_id) for user_id in user_ids])
+
+    def invalidate_all(self):
+        self.cache.set(self.version_key, time.time_ns(), None)
+
+
+class DefaultPermissionCache(LazyObject):
+    def _setup(self):
+        conf = settings.PERMISSION_CACHE
+        self._wrapped = import_string(conf["BACKEND"])(**conf.get("OPTIONS", {}))
+
+
+permission_cache = DefaultPermissionCache()
@@ -2,14 +2,18 @@ from base_django_rest_framework.utils import token_generator
 
 AUTH_USER_MODEL = "base_django_rest_framework.User"
 
+AUTHENTICATION_BACKENDS = [
+    "base_django_rest_framework.backends.CachedModelBackend"
+]
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "base_django_rest_framework.authentication.OAuth2Authentication"
     ],
 
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle"
+        "base_django_rest_framework.throttles.AnonRateThrottle",
+        "base_django_rest_framework.throttles.UserRateThrottle"
     ],
 
     "DEFAULT_THROTTLE_RATES": {
@@ -20,17 +24,134 @@ REST_FRAMEWORK = {
         "email_user": "12/hour"
     },
 
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_PAGINATION_CLASS": "base_django_rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 25,
 
     "TEST_REQUEST_DEFAULT_FORMAT": "json"
 }
 
+THROTTLE = {
+    "cache": "default",
+    "redis_url": None,
+    "scopes": {}
+}
+
+ASYNC_VIEWS = None
+
 AUTHLIB_OAUTH2_PROVIDER = {
     "access_token_generator": token_generator,
     "refresh_token_generator": token_generator
 }
 
+OAUTH2_SIGNED_TOKEN = {
+    "key": None,
+    "salt": "base_django_rest_framework.oauth2.token"
+}
+
+OAUTH2_REFRESH_TOKEN_LIFETIME = None
+
+OAUTH2_TOKEN_CACHE = {
+    "BACKEND": "base_django_rest_framework.caches.OAuth2TokenCache",
+    "OPTIONS": {
+        "cache": "default",
+        "timeout": 300,
+        "local_maxsize": 1024,
+        "local_timeout": 0
+    }
+}
+
+OAUTH2_TOKEN_REVOCATION_LIST = {
+    "BACKEND": "base_django_rest_framework.caches.OAuth2TokenRevocationList",
+    "OPTIONS": {
+        "cache": "default",
+        "refresh_interval": 0
+    }
+}
+
+OAUTH2_TOKEN_PARTITIONING = {
+    "interval": "month",
+    "premake": 3
+}
+
+PERMISSION_CACHE = {
+    "BACKEND": "base_django_rest_framework.caches.PermissionCache",
+    "OPTIONS": {
+        "cache": "default",
+        "timeout": 3600
+    }
+}
+
+COUNT_CACHE = {
+    "BACKEND": "base_django_rest_framework.caches.CountCache",
+    "OPTIONS": {
+        "cache": "default",
+        "timeout": 60,
+        "threshold": 100000
+    }
+}
+
+LOGIN_GUARD = {
+    "BACKEND": "base_django_rest_framework.caches.LoginGuard",
+    "OPTIONS": {
+        "cache": "default",
+        "username_threshold": 5,
+        "ip_threshold": 20,
+        "base_delay": 1,
+        "max_delay": 900,
+        "window": 3600,
+        "ipv4_prefix": 32,
+        "ipv6_prefix": 64
+    }
+}
+
+PASSWORD_HASHING_EXECUTOR = {
+    "BACKEND": "base_django_rest_framework.hashers.PasswordHashingExecutor",
+    "OPTIONS": {
+        "pool": "thread",
+        "workers": 4,
+        "queue_size": 16,
+        "timeout": 10
+    }
+}
+
+USER_SIGNATURE = {
+    "salt": "base_django_rest_framework.users",
+    "single_use": True,
+    "cache": "default"
+}
+
+AVATAR_PROCESSOR = {
+    "BACKEND": "base_django_rest_framework.images.AvatarProcessor",
+    "OPTIONS": {
+        "sizes": [64, 256, 512],
+        "formats": ["webp", "jpeg"],
+        "quality": 80,
+        "max_bytes": 5 * 1024 * 1024,
+        "max_pixels": 4096 * 4096,
+        "workers": 2,
+        "background": True
+    }
+}
+
+AVATAR_UPLOAD = {
+    "directory": "uploads",
+    "max_uploads": 3,
+    "max_age": 24 * 60 * 60
+}
+
+EMAIL_OUTBOX = False
+
+EMAIL_OUTBOX_DISPATCHER = {
+    "BACKEND": "base_django_rest_framework.mail.OutboxEmailDispatcher",
+    "OPTIONS": {
+        "workers": 1,
+        "lease": 5 * 60,
+        "max_attempts": 5,
+        "backoff": 60,
+        "background": True
+    }
+}
+
 EMAIL_CONFIRMATION_URL = "https://example.com/email/verify/?signature={signature}"
 EMAIL_CHANGE_URL = "https://example.com/email/update/?signature={signature}"
 PASSWORD_RESET_URL = "https://example.com/password/reset/?signature={signature}"
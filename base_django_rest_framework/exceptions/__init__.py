@@ -0,0 +1,2 @@
+from .service import ServiceUnavailable
+from .upload import PayloadTooLarge
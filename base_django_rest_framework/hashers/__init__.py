@@ -0,0 +1 @@
+from .executor import PasswordHashingExecutor, password_executor
@@ -0,0 +1,121 @@
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+
+import django
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.functional import LazyObject
+from django.utils.module_loading import import_string
+
+from base_django_rest_framework.exceptions import ServiceUnavailable
+
+
+def _call(func, *args):
+    started_at = time.monotonic()
+    return started_at, func(*args)
+
+
+class PasswordHashingExecutor:
+    pools = {
+        "thread": ThreadPoolExecutor,
+        "process": ProcessPoolExecutor
+    }
+
+    def __init__(self, pool="thread", workers=4, queue_size=16, timeout=10):
+        if pool not in self.pools:
+            raise ImproperlyConfigured(f"Password hashing pool must be one of {', '.join(self.pools)}.")
+        self.pool = pool
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.lock = threading.Lock()
+        self.executor = None
+        self.metrics = dict.fromkeys(
+            ("submitted", "completed", "rejected", "timed_out", "in_flight", "peak_in_flight"), 0)
+        self.metrics.update(wait_time=0.0, run_time=0.0)
+
+    def get_executor(self):
+        with self.lock:
+            if self.executor is None:
+                if self.pool == "process":
+                    self.executor = ProcessPoolExecutor(self.workers, initializer=django.setup)
+                else:
+                    self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="password-hashing")
+            return self.executor
+
+    def run(self, func, *args):
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.metrics["rejected"] += 1
+            raise ServiceUnavailable("Too many concurrent password operations, try again later.")
+        queued_at = time.monotonic()
+        with self.lock:
+            self.metrics["submitted"] += 1
+            self.metrics["in_flight"] += 1
+            self.metrics["peak_in_flight"] = max(self.metrics["peak_in_flight"], self.metrics["in_flight"])
+        try:
+            future = self.get_executor().submit(_call, func, *args)
+            started_at, result = future.result(timeout=self.timeout)
+        except TimeoutError:
+            with self.lock:
+                self.metrics["timed_out"] += 1
+            future.add_done_callback(lambda done: self.release())
+            raise ServiceUnavailable("Password operation timed out, try again later.")
+        except BaseException:
+            self.release()
+            raise
+        self.release(queued_at, started_at)
+        return result
+
+    def release(self, queued_at=None, started_at=None):
+        finished_at = time.monotonic()
+        with self.lock:
+            self.metrics["in_flight"] -= 1
+            if started_at is not None:
+                self.metrics["completed"] += 1
+                self.metrics["wait_time"] += started_at - queued_at
+                self.metrics["run_time"] += finished_at - started_at
+        self.slots.release()
+
+    def make_password(self, password):
+        return self.run(hashers.make_password, password)
+
+    def check_password(self, password, encoded, setter=None):
+        if password is None or not hashers.is_password_usable(encoded):
+            return False
+        is_correct = self.run(hashers.check_password, password, encoded)
+        if is_correct and setter is not None:
+            preferred, hasher = hashers.get_hasher("default"), hashers.identify_hasher(encoded)
+            if preferred.algorithm != hasher.algorithm or preferred.must_update(encoded):
+                setter(password)
+        return is_correct
+
+    def stats(self):
+        with self.lock:
+            metrics = self.metrics.copy()
+        completed = metrics["completed"] or 1
+        return {
+            "pool": self.pool,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "submitted": metrics["submitted"],
+            "completed": metrics["completed"],
+            "rejected": metrics["rejected"],
+            "timed_out": metrics["timed_out"],
+            "in_flight": metrics["in_flight"],
+            "peak_in_flight": metrics["peak_in_flight"],
+            "average_wait_time": metrics["wait_time"] / completed,
+            "average_run_time": metrics["run_time"] / completed
+        }
+
+
+class DefaultPasswordHashingExecutor(LazyObject):
+    def _setup(self):
+        conf = settings.PASSWORD_HASHING_EXECUTOR
+        self._wrapped = import_string(conf["BACKEND"])(**conf.get("OPTIONS", {}))
+
+
+password_executor = DefaultPasswordHashingExecutor()
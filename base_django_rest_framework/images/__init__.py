@@ -0,0 +1,2 @@
+from .avatar import AvatarProcessor, avatar_processor
+from .upload import ChunkedUpload
@@ -0,0 +1,162 @@
+import logging
+import posixpath
+import re
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from PIL import Image, ImageOps
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils.functional import LazyObject
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class AvatarProcessor:
+    accepted_formats = ("JPEG", "PNG", "GIF", "WEBP")
+    variant_formats = {
+        "webp": ("WEBP", "RGBA"),
+        "jpeg": ("JPEG", "RGB")
+    }
+    key_pattern = re.compile(r"[0-9a-f]{64}")
+
+    def __init__(self, sizes=(64, 256, 512), formats=("webp", "jpeg"), quality=80, max_bytes=5 * 1024 * 1024,
+                 max_pixels=4096 * 4096, workers=2, background=True):
+        for variant_format in formats:
+            if variant_format not in self.variant_formats:
+                raise ImproperlyConfigured(f"Avatar variant formats must be in {', '.join(self.variant_formats)}.")
+        self.sizes = sorted(sizes, reverse=True)
+        self.formats = formats
+        self.quality = quality
+        self.max_bytes = max_bytes
+        self.max_pixels = max_pixels
+        self.workers = workers
+        self.background = background
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def open(self, file):
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", Image.DecompressionBombWarning)
+                image = Image.open(file)
+        except (OSError, SyntaxError, ValueError, Image.DecompressionBombError, Image.DecompressionBombWarning):
+            raise ValidationError("Upload a valid image.", code="invalid_image")
+        if image.format not in self.accepted_formats:
+            raise ValidationError(
+                f"Avatar format must be one of {', '.join(self.accepted_formats)}.", code="invalid_image_format")
+        if image.width * image.height > self.max_pixels:
+            raise ValidationError(
+                f"Avatar must not have more than {self.max_pixels} pixels.", code="max_pixels")
+        return image
+
+    def validate(self, file):
+        if file.size is not None and file.size > self.max_bytes:
+            raise ValidationError(f"Avatar must not be larger than {self.max_bytes} bytes.", code="max_bytes")
+        image = self.open(file)
+        if hasattr(file, "content_type"):
+            file.content_type = Image.MIME.get(image.format)
+        file.seek(0)
+        return file
+
+    def get_key(self, name):
+        key = posixpath.splitext(posixpath.basename(name))[0]
+        if self.key_pattern.fullmatch(key):
+            return key
+        return None
+
+    def get_variant_names(self, name):
+        key = self.get_key(name)
+        if key is None:
+            return {}
+        directory = posixpath.join(posixpath.dirname(name), key)
+        return {
+            size: {
+                variant_format: posixpath.join(directory, f"{size}.{variant_format}")
+                for variant_format in self.formats
+            }
+            for size in self.sizes
+        }
+
+    def get_variant_urls(self, storage, name):
+        return {
+            str(size): {variant_format: storage.url(variant) for variant_format, variant in variants.items()}
+            for size, variants in sorted(self.get_variant_names(name).items())
+        } or None
+
+    def get_executor(self):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="avatar-processing")
+            return self.executor
+
+    def submit(self, func, *args):
+        if not self.background:
+            return func(*args)
+        future = self.get_executor().submit(func, *args)
+        future.add_done_callback(lambda done: done.exception() and logger.error(
+            "Avatar task %s%r failed.", func.__name__, args, exc_info=done.exception()))
+        return future
+
+    def schedule(self, func, *args, using=None):
+        transaction.on_commit(lambda: self.submit(func, *args), using=using)
+
+    def process(self, storage, name):
+        return self.submit(self.generate, storage, name)
+
+    def generate(self, storage, name):
+        variant_names = self.get_variant_names(name)
+        pending = {
+            size: {
+                variant_format: variant
+                for variant_format, variant in variants.items()
+                if not storage.exists(variant)
+            }
+            for size, variants in variant_names.items()
+        }
+        if not any(pending.values()):
+            return []
+        generated = []
+        with storage.open(name) as file:
+            image = self.open(file)
+            image.draft("RGB", (self.sizes[0], self.sizes[0]))
+            image.load()
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "PA", "P") else "RGB")
+        for size in self.sizes:
+            image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+            for variant_format, variant in pending[size].items():
+                generated.append(storage.save(variant, ContentFile(self.encode(image, variant_format))))
+        return generated
+
+    def encode(self, image, variant_format):
+        pil_format, mode = self.variant_formats[variant_format]
+        if mode == "RGB" and image.mode == "RGBA":
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        elif image.mode != mode:
+            image = image.convert(mode)
+        buffer = BytesIO()
+        image.save(buffer, pil_format, quality=self.quality)
+        return buffer.getvalue()
+
+    def delete(self, storage, name):
+        for variants in self.get_variant_names(name).values():
+            for variant in variants.values():
+                storage.delete(variant)
+        storage.delete(name)
+
+
+class DefaultAvatarProcessor(LazyObject):
+    def _setup(self):
+        conf = settings.AVATAR_PROCESSOR
+        self._wrapped = import_string(conf["BACKEND"])(**conf.get("OPTIONS", {}))
+
+
+avatar_processor = DefaultAvatarProcessor()
@@ -0,0 +1,137 @@
+import os
+import posixpath
+import re
+from datetime import timedelta
+from uuid import uuid4
+
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError, NotFound, Throttled
+
+from base_django_rest_framework.exceptions import PayloadTooLarge
+
+
+class ChunkedUpload:
+    id_pattern = re.compile(r"[0-9a-f]{32}")
+    range_pattern = re.compile(r"bytes (?:(\d+)-(\d+)|\*)/(\d+)")
+    read_size = 64 * 1024
+
+    def __init__(self, storage, directory, max_bytes, max_uploads=3, max_age=24 * 60 * 60):
+        self.storage = storage
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_uploads = max_uploads
+        self.max_age = max_age
+
+    def read(self, stream, length, name="upload"):
+        if length > self.max_bytes:
+            raise PayloadTooLarge()
+        file = TemporaryUploadedFile(name, "application/octet-stream", length, None)
+        received = 0
+        while stream is not None and received < length:
+            chunk = stream.read(min(self.read_size, length - received))
+            if not chunk:
+                break
+            file.write(chunk)
+            received += len(chunk)
+        if not received or received != length:
+            file.close()
+            raise ValidationError("Upload body is empty or shorter than its Content-Length.")
+        file.seek(0)
+        return file
+
+    def parse_range(self, content_range, length):
+        match = self.range_pattern.fullmatch(content_range.strip())
+        if match is None:
+            raise ValidationError("Content-Range must be 'bytes <start>-<end>/<total>' or 'bytes */<total>'.")
+        start, end, total = [int(value) if value is not None else None for value in match.groups()]
+        if total > self.max_bytes:
+            raise PayloadTooLarge()
+        if start is not None and (start > end or end >= total or end - start + 1 != length):
+            raise ValidationError("Content-Range does not match the upload body.")
+        return start, end, total
+
+    def get_directory(self, upload_id):
+        return posixpath.join(self.directory, upload_id)
+
+    def get_uploads(self):
+        try:
+            directories, _ = self.storage.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return [name for name in directories if self.id_pattern.fullmatch(name)]
+
+    def is_stale(self, upload_id, now=None):
+        cutoff = (now or timezone.now()) - timedelta(seconds=self.max_age)
+        directory = self.get_directory(upload_id)
+        return all(self.storage.get_modified_time(posixpath.join(directory, f"{start}-{end}")) < cutoff
+                   for start, end in self.get_chunks(upload_id))
+
+    def sweep(self, now=None):
+        stale = [upload_id for upload_id in self.get_uploads() if self.is_stale(upload_id, now)]
+        for upload_id in stale:
+            self.discard(upload_id)
+        self.remove_directory(self.directory)
+        return len(stale)
+
+    def start(self):
+        self.sweep()
+        if len(self.get_uploads()) >= self.max_uploads:
+            raise Throttled(detail="Too many unfinished uploads, finish or wait for them to expire.")
+        return uuid4().hex
+
+    def get_chunks(self, upload_id):
+        try:
+            _, files = self.storage.listdir(self.get_directory(upload_id))
+        except FileNotFoundError:
+            return []
+        return sorted(tuple(map(int, name.split("-"))) for name in files)
+
+    def get_received(self, upload_id):
+        received = 0
+        for start, end in self.get_chunks(upload_id):
+            if start != received:
+                break
+            received = end + 1
+        return received
+
+    def receive(self, upload_id, content_range, stream, length):
+        start, end, total = self.parse_range(content_range, length)
+        if upload_id is None:
+            if start not in (None, 0):
+                raise ValidationError("A new upload must start at byte 0.")
+            upload_id = self.start()
+            received = 0
+        elif not self.id_pattern.fullmatch(upload_id):
+            raise NotFound("Upload not found.")
+        else:
+            received = self.get_received(upload_id)
+            if not received and start != 0:
+                raise NotFound("Upload not found.")
+        if start == received:
+            with self.read(stream, length) as file:
+                self.storage.save(posixpath.join(self.get_directory(upload_id), f"{start}-{end}"), file)
+            received = end + 1
+        return upload_id, received, total
+
+    def assemble(self, upload_id, total, name="upload"):
+        file = TemporaryUploadedFile(name, "application/octet-stream", total, None)
+        for start, end in self.get_chunks(upload_id):
+            with self.storage.open(posixpath.join(self.get_directory(upload_id), f"{start}-{end}")) as chunk:
+                for data in chunk.chunks(self.read_size):
+                    file.write(data)
+        file.seek(0)
+        return file
+
+    def discard(self, upload_id):
+        directory = self.get_directory(upload_id)
+        for start, end in self.get_chunks(upload_id):
+            self.storage.delete(posixpath.join(directory, f"{start}-{end}"))
+        self.remove_directory(directory)
+        self.remove_directory(self.directory)
+
+    def remove_directory(self, directory):
+        try:
+            os.rmdir(self.storage.path(directory))
+        except (NotImplementedError, OSError):
+            pass
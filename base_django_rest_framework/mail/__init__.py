@@ -0,0 +1,2 @@
+from .outbox import OutboxEmailDispatcher, outbox_dispatcher
+from .renderer import ActionEmailRenderer, action_email_renderer
@@ -0,0 +1,63 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import connections
+from django.utils.functional import LazyObject
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxEmailDispatcher:
+    def __init__(self, workers=1, lease=300, max_attempts=5, backoff=60, background=True):
+        self.workers = workers
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.background = background
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def get_executor(self):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="outbox-email")
+            return self.executor
+
+    def dispatch(self, *pks, using=None):
+        if not self.background:
+            return self.send(*pks, using=using)
+        future = self.get_executor().submit(self.run, *pks, using=using)
+        future.add_done_callback(lambda done: done.exception() and logger.error(
+            "Sending outbox emails %r failed.", pks, exc_info=done.exception()))
+        return future
+
+    def run(self, *pks, using=None):
+        try:
+            return self.send(*pks, using=using)
+        finally:
+            connections.close_all()
+
+    def send(self, *pks, using=None):
+        manager = apps.get_model("base_django_rest_framework", "OutboxEmail").objects.db_manager(using)
+        emails = manager.filter(pk__in=pks).claim(len(pks), self.lease)
+        if not emails:
+            return [], []
+        connection = get_connection(fail_silently=False)
+        try:
+            return manager.deliver(emails, connection, self.max_attempts, self.backoff)
+        finally:
+            connection.close()
+
+
+class DefaultOutboxEmailDispatcher(LazyObject):
+    def _setup(self):
+        conf = settings.EMAIL_OUTBOX_DISPATCHER
+        self._wrapped = import_string(conf["BACKEND"])(**conf.get("OPTIONS", {}))
+
+
+outbox_dispatcher = DefaultOutboxEmailDispatcher()
@@ -0,0 +1,53 @@
+import threading
+
+from django.template import Context, loader
+from django.utils.functional import LazyObject
+
+
+class ActionEmailRenderer:
+    text_template_name = "base_django_rest_framework/action.txt"
+    html_template_name = "base_django_rest_framework/action.html"
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.templates = None
+
+    def get_templates(self):
+        templates = self.templates
+        if templates is None:
+            with self.lock:
+                if self.templates is None:
+                    self.templates = tuple(
+                        loader.get_template(template_name).template
+                        for template_name in (self.text_template_name, self.html_template_name))
+                templates = self.templates
+        return templates
+
+    def reset(self):
+        with self.lock:
+            self.templates = None
+
+    def get_context(self, context):
+        text_template, _ = self.get_templates()
+        return Context(context, autoescape=text_template.engine.autoescape)
+
+    def render(self, context):
+        return self.render_context(self.get_context(context))
+
+    def render_many(self, context, recipient_contexts):
+        context = self.get_context(context)
+        for recipient_context in recipient_contexts:
+            with context.push(recipient_context):
+                yield self.render_context(context)
+
+    def render_context(self, context):
+        text_template, html_template = self.get_templates()
+        return text_template.render(context), html_template.render(context)
+
+
+class DefaultActionEmailRenderer(LazyObject):
+    def _setup(self):
+        self._wrapped = ActionEmailRenderer()
+
+
+action_email_renderer = DefaultActionEmailRenderer()
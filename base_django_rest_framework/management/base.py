@@ -0,0 +1,69 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from base_django_rest_framework.models import OAuth2Token
+
+
+class TokenCleanupCommand(BaseCommand):
+    help = "Delete expired and revoked oAuth2 tokens"
+    requires_migrations_checks = True
+    ordering = ("pk",)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch_size",
+            type=int,
+            default=1000,
+            help="Number of tokens deleted per batch, default=1000"
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to sleep between batches, default=0"
+        )
+        parser.add_argument(
+            "--max_runtime",
+            type=float,
+            default=0,
+            help="Seconds after which to stop, default=0 (no limit)"
+        )
+        parser.add_argument(
+            "--dry_run",
+            action="store_true",
+            help="Only count the tokens that would be deleted"
+        )
+
+    def get_queryset(self):
+        return OAuth2Token.objects.filter(Q(revoked=True) | Q(expires_at__lte=time.time())).purgeable()
+
+    def handle(self, *args, **options):
+        queryset = self.get_queryset()
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(f"Would delete {queryset.count()} tokens."))
+            return
+
+        batch_size = options["batch_size"]
+        deadline = time.monotonic() + options["max_runtime"] if options["max_runtime"] else None
+        deleted = 0
+
+        while True:
+            pks = list(queryset.order_by(*self.ordering).values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                break
+            count = OAuth2Token.objects.using(queryset.db).filter(pk__in=pks).delete()[1].get(
+                OAuth2Token._meta.label, 0)
+            deleted += count
+            self.stdout.write(f"Deleted {count} tokens ({deleted} so far).")
+            if len(pks) < batch_size:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                self.stdout.write(self.style.WARNING("Stopped after reaching the maximum runtime."))
+                break
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully deleted {deleted} tokens."))
@@ -1,14 +1,10 @@
-from django.core.management.base import BaseCommand
-
 from base_django_rest_framework.models import OAuth2Token
+from ..base import TokenCleanupCommand
 
 
-class Command(BaseCommand):
+class Command(TokenCleanupCommand):
     help = "Delete expired oAuth2 tokens"
-    requires_migrations_checks = True
+    ordering = ("expires_at", "pk")
 
-    def handle(self, *args, **options):
-        deleted, row_count = OAuth2Token.objects.filter(is_expired_=True).delete()
-        self.stdout.write(
-            self.style.SUCCESS(f"Successfully deleted {row_count.get(getattr(OAuth2Token, '_meta').label, 0)} tokens.")
-        )
+    def get_queryset(self):
+        return OAuth2Token.objects.expired().purgeable()
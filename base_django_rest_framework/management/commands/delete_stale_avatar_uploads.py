@@ -0,0 +1,36 @@
+import posixpath
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from base_django_rest_framework.images import ChunkedUpload, avatar_processor
+
+
+class Command(BaseCommand):
+    help = "Delete unfinished avatar uploads that have not received a chunk within their maximum age"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max_age",
+            type=int,
+            default=settings.AVATAR_UPLOAD["max_age"],
+            help=f"Seconds since the last chunk after which an upload is stale, "
+                 f"default={settings.AVATAR_UPLOAD['max_age']}"
+        )
+
+    def handle(self, *args, **options):
+        field = get_user_model()._meta.get_field("avatar")
+        root = posixpath.join(field.upload_to, settings.AVATAR_UPLOAD["directory"])
+        try:
+            directories, _ = field.storage.listdir(root)
+        except FileNotFoundError:
+            directories = []
+
+        deleted = 0
+        for directory in directories:
+            upload = ChunkedUpload(field.storage, posixpath.join(root, directory), avatar_processor.max_bytes,
+                                   max_age=options["max_age"])
+            deleted += upload.sweep()
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully deleted {deleted} stale uploads."))
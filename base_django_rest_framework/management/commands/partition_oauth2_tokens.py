@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from base_django_rest_framework.utils import OAuth2TokenPartitioner
+
+
+class Command(BaseCommand):
+    help = "Maintain time partitions of the oAuth2 token table (PostgreSQL only)"
+    requires_migrations_checks = True
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            choices=OAuth2TokenPartitioner.intervals,
+            default=settings.OAUTH2_TOKEN_PARTITIONING["interval"],
+            help=f"default=\"{settings.OAUTH2_TOKEN_PARTITIONING['interval']}\""
+        )
+        parser.add_argument(
+            "--premake",
+            type=int,
+            default=settings.OAUTH2_TOKEN_PARTITIONING["premake"],
+            help=f"Number of future partitions to create, default={settings.OAUTH2_TOKEN_PARTITIONING['premake']}"
+        )
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Convert the existing table into a partitioned table"
+        )
+        parser.add_argument(
+            "--keep_expired",
+            action="store_true",
+            help="Do not drop partitions whose tokens have all expired"
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help=f"default=\"{DEFAULT_DB_ALIAS}\""
+        )
+
+    def handle(self, *args, **options):
+        if connections[options["database"]].vendor != "postgresql":
+            raise CommandError("Token partitioning is only supported on PostgreSQL.")
+
+        partitioner = OAuth2TokenPartitioner(options["interval"], options["database"])
+
+        if options["convert"]:
+            if partitioner.is_partitioned():
+                raise CommandError("The oAuth2 token table is already partitioned.")
+            partitioner.convert()
+            self.stdout.write(self.style.SUCCESS("Successfully converted the oAuth2 token table."))
+        elif not partitioner.is_partitioned():
+            raise CommandError("The oAuth2 token table is not partitioned, run with --convert first.")
+
+        for name in partitioner.premake(options["premake"]):
+            self.stdout.write(f"Created partition {name}.")
+
+        if not options["keep_expired"]:
+            for name in partitioner.drop_expired():
+                self.stdout.write(f"Dropped partition {name}.")
+
+        self.stdout.write(self.style.SUCCESS("Successfully partitioned oAuth2 tokens."))
@@ -0,0 +1,170 @@
+import multiprocessing
+import os
+import time
+import uuid
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from base_django_rest_framework.mail import action_email_renderer
+
+
+class Command(BaseCommand):
+    help = "Send an announcement email to all active users"
+    requires_migrations_checks = True
+
+    def add_arguments(self, parser):
+        parser.add_argument("--subject", required=True)
+        parser.add_argument("--action", required=True)
+        parser.add_argument("--action_text", required=True)
+        parser.add_argument("--action_link", required=True)
+        parser.add_argument(
+            "--theme",
+            default="",
+            help="default=\"\""
+        )
+        parser.add_argument(
+            "--verified_only",
+            action="store_true",
+            help="Only email users with a verified email address"
+        )
+        parser.add_argument(
+            "--chunk_size",
+            type=int,
+            default=500,
+            help="Recipients fetched and checkpointed at a time, default=500"
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=0,
+            help="Maximum messages per second across all workers, default=0 (no limit)"
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of worker processes, default=1"
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="Directory in which progress is recorded so that an interrupted run can be resumed"
+        )
+        parser.add_argument(
+            "--dry_run",
+            action="store_true",
+            help="Only count the recipients"
+        )
+
+    def get_queryset(self, options):
+        queryset = get_user_model().objects.filter(is_active=True)
+        if options["verified_only"]:
+            queryset = queryset.filter(is_verified=True)
+        return queryset
+
+    def handle(self, *args, **options):
+        if options["workers"] < 1:
+            raise CommandError("There must be at least one worker.")
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(f"Would email {self.get_queryset(options).count()} users."))
+            return
+
+        if options["checkpoint"]:
+            Path(options["checkpoint"]).mkdir(parents=True, exist_ok=True)
+
+        if options["workers"] == 1:
+            sent = self.send(0, options)
+        else:
+            connections.close_all()
+            context = multiprocessing.get_context("fork")
+            counts = context.Array("q", options["workers"])
+            processes = [
+                context.Process(target=self.run_worker, args=(index, options, counts))
+                for index in range(options["workers"])
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            failed = [index for index, process in enumerate(processes) if process.exitcode != 0]
+            if failed:
+                raise CommandError(
+                    f"Workers {', '.join(map(str, failed))} failed after emailing {sum(counts)} users, "
+                    f"run again with the same --checkpoint and --workers to resume.")
+            sent = sum(counts)
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully emailed {sent} users."))
+
+    def run_worker(self, index, options, counts):
+        try:
+            self.send(index, options, counts)
+        finally:
+            connections.close_all()
+
+    def get_checkpoint_path(self, index, options):
+        if options["checkpoint"]:
+            return Path(options["checkpoint"]) / f"worker-{index}-of-{options['workers']}"
+
+    def save_checkpoint(self, path, last_id):
+        if path is not None:
+            temporary_path = path.with_suffix(".tmp")
+            temporary_path.write_text(str(last_id))
+            os.replace(temporary_path, path)
+
+    def send(self, index, options, counts=None):
+        workers = options["workers"]
+        queryset = self.get_queryset(options).filter(id__gte=uuid.UUID(int=(2 ** 128 * index) // workers))
+        if index < workers - 1:
+            queryset = queryset.filter(id__lt=uuid.UUID(int=(2 ** 128 * (index + 1)) // workers))
+
+        checkpoint_path = self.get_checkpoint_path(index, options)
+        if checkpoint_path is not None and checkpoint_path.exists():
+            queryset = queryset.filter(id__gt=uuid.UUID(checkpoint_path.read_text()))
+
+        queryset = queryset.order_by("id").only("id", "first_name", "last_name", "email")
+        interval = workers / options["rate"] if options["rate"] else 0
+        context = {
+            "theme": options["theme"],
+            "title": options["subject"],
+            "action": options["action"],
+            "action_text": options["action_text"],
+            "action_link": options["action_link"]
+        }
+        connection = get_connection(fail_silently=False)
+        sent, started_at, users = 0, time.monotonic(), []
+
+        def flush():
+            nonlocal sent
+            recipients = [{"user": user.get_short_name()} for user in users]
+            for user, (message, html_message) in zip(users, action_email_renderer.render_many(context, recipients)):
+                if interval:
+                    delay = started_at + sent * interval - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                email = EmailMultiAlternatives(
+                    options["subject"], message, None, [f"{user.get_full_name()} <{user.email}>"],
+                    connection=connection)
+                email.attach_alternative(html_message, "text/html")
+                connection.send_messages([email])
+                sent += 1
+            self.save_checkpoint(checkpoint_path, users[-1].id)
+            if counts is not None:
+                counts[index] = sent
+            users.clear()
+
+        try:
+            connection.open()
+            for user in queryset.iterator(chunk_size=options["chunk_size"]):
+                users.append(user)
+                if len(users) >= options["chunk_size"]:
+                    flush()
+            if users:
+                flush()
+        finally:
+            connection.close()
+
+        return sent
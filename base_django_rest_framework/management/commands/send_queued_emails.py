@@ -0,0 +1,81 @@
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from base_django_rest_framework.models import OutboxEmail
+
+
+class Command(BaseCommand):
+    help = "Send queued emails from the outbox"
+    requires_migrations_checks = True
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch_size",
+            type=int,
+            default=100,
+            help="Number of emails sent per batch, default=100"
+        )
+        parser.add_argument(
+            "--max_attempts",
+            type=int,
+            default=settings.EMAIL_OUTBOX_DISPATCHER["OPTIONS"]["max_attempts"],
+            help=f"Attempts before an email is marked as failed, "
+                 f"default={settings.EMAIL_OUTBOX_DISPATCHER['OPTIONS']['max_attempts']}"
+        )
+        parser.add_argument(
+            "--backoff",
+            type=float,
+            default=settings.EMAIL_OUTBOX_DISPATCHER["OPTIONS"]["backoff"],
+            help=f"Seconds before the first retry, doubled on every attempt, "
+                 f"default={settings.EMAIL_OUTBOX_DISPATCHER['OPTIONS']['backoff']}"
+        )
+        parser.add_argument(
+            "--lease",
+            type=float,
+            default=settings.EMAIL_OUTBOX_DISPATCHER["OPTIONS"]["lease"],
+            help=f"Seconds a claimed email is hidden from other workers while it is sent, "
+                 f"default={settings.EMAIL_OUTBOX_DISPATCHER['OPTIONS']['lease']}"
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the outbox instead of exiting once it is drained"
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to sleep between polls when looping, default=5"
+        )
+
+    def handle(self, *args, **options):
+        connection = get_connection(fail_silently=False)
+        totals = {"sent": 0, "retried": 0, "failed": 0}
+
+        try:
+            while True:
+                count = self.send_batch(connection, totals, options)
+                if count < options["batch_size"]:
+                    if not options["loop"]:
+                        break
+                    time.sleep(options["interval"])
+        finally:
+            connection.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Successfully sent {totals['sent']} emails, {totals['retried']} retried, {totals['failed']} failed."))
+
+    def send_batch(self, connection, totals, options):
+        emails = OutboxEmail.objects.claim(options["batch_size"], options["lease"])
+        if not emails:
+            return 0
+
+        sent, unsent = OutboxEmail.objects.deliver(emails, connection, options["max_attempts"], options["backoff"])
+        failed = sum(email.status == OutboxEmail.Status.FAILED for email in unsent)
+        totals["sent"] += len(sent)
+        totals["retried"] += len(unsent) - failed
+        totals["failed"] += failed
+        return len(emails)
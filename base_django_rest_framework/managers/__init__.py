@@ -1,2 +1,3 @@
+from .email import OutboxEmailManager
 from .oauth2 import OAuth2ClientManager, OAuth2TokenManager
 from .user import UserManager
@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Manager, QuerySet
+from django.utils import timezone
+
+
+class OutboxEmailQuerySet(QuerySet):
+    def pending(self):
+        return self.filter(status=self.model.Status.PENDING)
+
+    def failed(self):
+        return self.filter(status=self.model.Status.FAILED)
+
+    def due(self):
+        return self.pending().filter(available_at__lte=timezone.now())
+
+    def claim(self, limit, lease):
+        with transaction.atomic(using=self.db):
+            emails = list(self.due().select_for_update(skip_locked=True)[:limit])
+            if emails:
+                self.model.objects.using(self.db).filter(pk__in=[email.pk for email in emails]).update(
+                    available_at=timezone.now() + timedelta(seconds=lease))
+        return emails
+
+
+class OutboxEmailManager(Manager.from_queryset(OutboxEmailQuerySet)):
+    def enqueue(self, subject, message, from_email, recipient_list, html_message=None):
+        from base_django_rest_framework.mail import outbox_dispatcher
+
+        email = self.create(
+            subject=subject,
+            body=message,
+            html_body=html_message or "",
+            from_email=from_email or "",
+            to=list(recipient_list))
+        transaction.on_commit(lambda: outbox_dispatcher.dispatch(email.pk, using=self.db), using=self.db)
+        return email
+
+    def deliver(self, emails, connection, max_attempts, backoff):
+        sent, unsent = [], []
+        for email in emails:
+            try:
+                connection.open()
+                connection.send_messages([email.get_message(connection)])
+            except Exception as error:
+                connection.close()
+                email.fail(error, max_attempts, backoff)
+                unsent.append(email)
+            else:
+                sent.append(email.pk)
+
+        self.filter(pk__in=sent).delete()
+        self.bulk_update(unsent, ["attempts", "last_error", "status", "available_at"])
+        return sent, unsent
@@ -1,13 +1,15 @@
 import time
 
-from django.db.models import Manager, Case, When, Q
+from django.db.models import Manager, QuerySet, Q
 
 
-class OAuth2ClientManager(Manager):
-    def get_queryset(self):
-        return super().get_queryset().annotate(
-            client_secret_is_expired=Case(
-                When(Q(client_secret_expires_at=0) | Q(client_secret_expires_at__gt=time.time()), then=False),
-                default=True
-            )
-        )
+class OAuth2ClientQuerySet(QuerySet):
+    def client_secret_expired(self):
+        return self.filter(client_secret_expires_at__gt=0, client_secret_expires_at__lte=time.time())
+
+    def client_secret_active(self):
+        return self.filter(Q(client_secret_expires_at=0) | Q(client_secret_expires_at__gt=time.time()))
+
+
+class OAuth2ClientManager(Manager.from_queryset(OAuth2ClientQuerySet)):
+    pass
@@ -1,11 +1,37 @@
 import time
 
-from django.db.models import Manager, Case, When, Q, F
+from django.conf import settings
+from django.db.models import Manager, QuerySet, Q
 
 
-class OAuth2TokenManager(Manager):
-    def get_queryset(self):
-        return super().get_queryset().annotate(
-            expires_at=F("issued_at") + F("expires_in"),
-            is_expired_=Case(When(Q(expires_in=0) | Q(expires_at__gt=time.time()), then=False), default=True)
-        )
+class OAuth2TokenQuerySet(QuerySet):
+    def expired(self):
+        return self.filter(expires_at__lte=time.time())
+
+    def unexpired(self):
+        return self.filter(Q(expires_at__isnull=True) | Q(expires_at__gt=time.time()))
+
+    def active(self):
+        return self.unexpired().filter(revoked=False)
+
+    def refreshable(self):
+        lifetime = settings.OAUTH2_REFRESH_TOKEN_LIFETIME
+        queryset = self.filter(revoked=False)
+        return queryset if lifetime is None else queryset.filter(issued_at__gt=time.time() - lifetime)
+
+    def purgeable(self):
+        families = self.model.objects.using(self.db).refreshable().values("family")
+        return self.exclude(revoked=True, family__in=families)
+
+    def revoke(self):
+        from base_django_rest_framework.signals import tokens_revoked
+
+        tokens = list(self.only("id", "access_token", "expires_at").order_by())
+        if tokens:
+            self.model.objects.filter(pk__in=[token.pk for token in tokens]).delete()
+            tokens_revoked.send(sender=self.model, tokens=tokens)
+        return len(tokens)
+
+
+class OAuth2TokenManager(Manager.from_queryset(OAuth2TokenQuerySet)):
+    pass
@@ -8,7 +8,15 @@ class UserManager(_UserManager):
     def _create_user(self, username, email, password, **extra_fields):
         if not email:
             raise ValueError("The given email must be set")
-        return super()._create_user(username, email, password, **extra_fields)
+        if not username:
+            raise ValueError("The given username must be set")
+        user = self.model(
+            username=self.model.normalize_username(username),
+            email=self.normalize_email(email),
+            **extra_fields)
+        user.set_password(password)
+        user.save(using=self._db)
+        return user
 
     def create_superuser(self, username, email=None, password=None, **extra_fields):
         return super().create_superuser(username, email, password, is_verified=True, **extra_fields)
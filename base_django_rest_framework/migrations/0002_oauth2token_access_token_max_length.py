@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base_django_rest_framework', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='oauth2token',
+            name='access_token',
+            field=models.CharField(editable=False, max_length=512, unique=True),
+        ),
+    ]
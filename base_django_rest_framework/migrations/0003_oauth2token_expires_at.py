@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:07
+
+from django.db import migrations, models
+
+
+def backfill_expires_at(apps, schema_editor):
+    OAuth2Token = apps.get_model("base_django_rest_framework", "OAuth2Token")
+    OAuth2Token.objects.filter(expires_in__gt=0).update(expires_at=models.F("issued_at") + models.F("expires_in"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base_django_rest_framework', '0002_oauth2token_access_token_max_length'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='oauth2token',
+            name='expires_at',
+            field=models.BigIntegerField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_expires_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='oauth2client',
+            index=models.Index(condition=models.Q(('client_secret_expires_at__gt', 0)), fields=['client_secret_expires_at'], name='oauth2client_secret_exp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='oauth2token',
+            index=models.Index(condition=models.Q(('revoked', False)), fields=['user', 'expires_at'], name='oauth2token_user_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='oauth2token',
+            index=models.Index(condition=models.Q(('expires_at__isnull', False)), fields=['expires_at'], name='oauth2token_expires_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='oauth2token',
+            index=models.Index(condition=models.Q(('revoked', True)), fields=['revoked'], name='oauth2token_revoked_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:02
+
+import uuid
+
+from django.db import migrations, models
+
+
+def backfill_family(apps, schema_editor):
+    OAuth2Token = apps.get_model("base_django_rest_framework", "OAuth2Token")
+    OAuth2Token.objects.update(family=models.F("id"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base_django_rest_framework', '0003_oauth2token_expires_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='oauth2token',
+            name='family',
+            field=models.UUIDField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_family, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='oauth2token',
+            name='family',
+            field=models.UUIDField(db_index=True, default=uuid.uuid4, editable=False),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:20
+
+from django.db import migrations, models
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base_django_rest_framework', '0004_oauth2token_family'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEmail',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('subject', models.CharField(editable=False, max_length=255)),
+                ('body', models.TextField(editable=False)),
+                ('html_body', models.TextField(blank=True, editable=False)),
+                ('from_email', models.CharField(blank=True, editable=False, max_length=254)),
+                ('to', models.JSONField(default=list, editable=False)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('failed', 'Failed')], default='pending', max_length=16)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True, editable=False)),
+            ],
+            options={
+                'verbose_name': 'outbox email',
+                'verbose_name_plural': 'outbox emails',
+                'ordering': ['available_at'],
+                'indexes': [models.Index(condition=models.Q(('status', 'pending')), fields=['available_at'], name='outboxemail_due_idx')],
+            },
+        ),
+    ]
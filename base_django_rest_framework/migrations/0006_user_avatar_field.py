@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:27
+
+import base_django_rest_framework.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base_django_rest_framework', '0005_outboxemail'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='avatar',
+            field=base_django_rest_framework.models.fields.AvatarField(blank=True, upload_to='users/avatars'),
+        ),
+    ]
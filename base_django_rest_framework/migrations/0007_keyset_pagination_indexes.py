@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base_django_rest_framework', '0006_user_avatar_field'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='oauth2token',
+            index=models.Index(fields=['user', '-issued_at', '-id'], name='oauth2token_user_issued_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-created_at', '-id'], name='user_created_at_id_idx'),
+        ),
+    ]
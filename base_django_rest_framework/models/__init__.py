@@ -1,3 +1,5 @@
-from .mixins import UUIDMixin, CreatedAtMixin, UpdatedAtMixin
+from .email import OutboxEmail
+from .fields import AvatarField
+from .mixins import UUIDMixin, CreatedAtMixin, UpdatedAtMixin, DirtyFieldsMixin
 from .oauth2 import OAuth2Client, OAuth2Token
 from .user import User
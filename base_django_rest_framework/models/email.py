@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from django.core.mail import EmailMultiAlternatives
+from django.db import models
+from django.utils import timezone
+
+from base_django_rest_framework.managers import OutboxEmailManager
+from .mixins import UUIDMixin, CreatedAtMixin
+
+
+class OutboxEmail(UUIDMixin, CreatedAtMixin):
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        FAILED = "failed", "Failed"
+
+    subject = models.CharField(max_length=255, editable=False)
+    body = models.TextField(editable=False)
+    html_body = models.TextField(blank=True, editable=False)
+    from_email = models.CharField(max_length=254, blank=True, editable=False)
+    to = models.JSONField(default=list, editable=False)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, editable=False)
+
+    objects = OutboxEmailManager()
+
+    class Meta:
+        verbose_name = "outbox email"
+        verbose_name_plural = "outbox emails"
+        ordering = ["available_at"]
+        indexes = [
+            models.Index(
+                fields=["available_at"],
+                condition=models.Q(status="pending"),
+                name="outboxemail_due_idx")
+        ]
+
+    def get_message(self, connection=None):
+        message = EmailMultiAlternatives(
+            self.subject,
+            self.body,
+            self.from_email or None,
+            self.to,
+            connection=connection)
+        if self.html_body:
+            message.attach_alternative(self.html_body, "text/html")
+        return message
+
+    def fail(self, error, max_attempts, backoff):
+        self.attempts += 1
+        self.last_error = str(error)
+        if self.attempts >= max_attempts:
+            self.status = self.Status.FAILED
+        else:
+            self.available_at = timezone.now() + timedelta(seconds=backoff * 2 ** (self.attempts - 1))
@@ -0,0 +1,43 @@
+import hashlib
+import mimetypes
+import posixpath
+
+from django.core.files import File
+from django.db import models
+from django.db.models.fields.files import ImageFieldFile
+
+from base_django_rest_framework.images import avatar_processor
+
+
+def validate_avatar(file):
+    if not getattr(file, "_committed", False):
+        avatar_processor.validate(file)
+
+
+class ContentAddressedImageFieldFile(ImageFieldFile):
+    def save(self, name, content, save=True):
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        extension = posixpath.splitext(name)[1].lower()
+        if getattr(content, "content_type", None):
+            extension = mimetypes.guess_extension(content.content_type) or extension
+        name = self.field.generate_filename(self.instance, f"{digest.hexdigest()}{extension}")
+        if self.storage.exists(name):
+            self.name = name
+        else:
+            self.name = self.storage.save(name, content, max_length=self.field.max_length)
+        setattr(self.instance, self.field.attname, self.name)
+        self._committed = True
+        if save:
+            self.instance.save()
+
+    save.alters_data = True
+
+
+class AvatarField(models.ImageField):
+    attr_class = ContentAddressedImageFieldFile
+    default_validators = [validate_avatar]
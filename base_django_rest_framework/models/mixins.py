@@ -1,6 +1,7 @@
 from uuid import uuid4
 
 from django.db import models
+from django.db.models.fields.files import FieldFile
 
 
 class UUIDMixin(models.Model):
@@ -22,3 +23,57 @@ class UpdatedAtMixin(models.Model):
 
     class Meta:
         abstract = True
+
+
+class DirtyFieldsMixin(models.Model):
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = instance.get_field_values()
+        return instance
+
+    def get_field_values(self, field_names=None):
+        deferred = self.get_deferred_fields()
+        values = {}
+        for field in self._meta.concrete_fields:
+            if field.attname in deferred or (field_names is not None and field.name not in field_names):
+                continue
+            value = getattr(self, field.attname)
+            if isinstance(value, FieldFile):
+                value = value.name if value._committed else object()
+            values[field.name] = value
+        return values
+
+    def get_dirty_fields(self):
+        loaded = getattr(self, "_loaded_values", None)
+        if loaded is None or self._state.adding:
+            return dict.fromkeys(self.get_field_values())
+        return {
+            name: loaded.get(name)
+            for name, value in self.get_field_values().items()
+            if name not in loaded or value != loaded[name]
+        }
+
+    def save(self, *args, **kwargs):
+        if not args and kwargs.get("update_fields") is None and not kwargs.get("force_insert") \
+                and not self._state.adding and getattr(self, "_loaded_values", None) is not None:
+            kwargs["update_fields"] = [
+                *self.get_dirty_fields(),
+                *[field.name for field in self._meta.concrete_fields if getattr(field, "auto_now", False)]
+            ]
+        super().save(*args, **kwargs)
+        self.snapshot(kwargs.get("update_fields"))
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using, fields)
+        self.snapshot(fields)
+
+    def snapshot(self, field_names=None):
+        if field_names is None:
+            self._loaded_values = self.get_field_values()
+        else:
+            field_names = {self._meta.get_field(name).name for name in field_names}
+            self._loaded_values = {**getattr(self, "_loaded_values", {}), **self.get_field_values(field_names)}
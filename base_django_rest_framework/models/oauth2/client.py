@@ -35,6 +35,15 @@ class OAuth2Client(UUIDMixin, ClientMixin):
         verbose_name = "oAuth2 client"
         verbose_name_plural = "oAuth2 clients"
         ordering = ["-client_id_issued_at"]
+        indexes = [
+            models.Index(
+                fields=["client_secret_expires_at"],
+                condition=models.Q(client_secret_expires_at__gt=0),
+                name="oauth2client_secret_exp_idx")
+        ]
+
+    def is_client_secret_expired(self):
+        return 0 < self.client_secret_expires_at <= time.time()
 
     def get_client_id(self):
         return self.client_id
@@ -1,4 +1,5 @@
 import time
+from uuid import uuid4
 
 from authlib.integrations.django_oauth2 import token_revoked
 from authlib.oauth2.rfc6749 import TokenMixin
@@ -6,6 +7,7 @@ from django.conf import settings
 from django.db import models
 
 from base_django_rest_framework.managers import OAuth2TokenManager
+from base_django_rest_framework.signing import OAuth2TokenSigner
 from .client import OAuth2Client
 from ..mixins import UUIDMixin
 
@@ -25,12 +27,14 @@ class OAuth2Token(UUIDMixin, TokenMixin):
         on_delete=models.CASCADE,
         editable=False)
     token_type = models.CharField(max_length=48, editable=False)
-    access_token = models.CharField(max_length=48, unique=True, editable=False)
+    access_token = models.CharField(max_length=512, unique=True, editable=False)
     refresh_token = models.CharField(max_length=48, unique=True, editable=False)
     scope = models.TextField(default="", editable=False)
     revoked = models.BooleanField(default=False, editable=False)
     issued_at = models.BigIntegerField(default=time.time, editable=False)
     expires_in = models.BigIntegerField(default=0, editable=False)
+    expires_at = models.BigIntegerField(null=True, editable=False)
+    family = models.UUIDField(default=uuid4, db_index=True, editable=False)
 
     objects = OAuth2TokenManager()
 
@@ -38,6 +42,33 @@ class OAuth2Token(UUIDMixin, TokenMixin):
         verbose_name = "oAuth2 token"
         verbose_name_plural = "oAuth2 tokens"
         ordering = ["-issued_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "-issued_at", "-id"],
+                name="oauth2token_user_issued_idx"),
+            models.Index(
+                fields=["user", "expires_at"],
+                condition=models.Q(revoked=False),
+                name="oauth2token_user_active_idx"),
+            models.Index(
+                fields=["expires_at"],
+                condition=models.Q(expires_at__isnull=False),
+                name="oauth2token_expires_at_idx"),
+            models.Index(
+                fields=["revoked"],
+                condition=models.Q(revoked=True),
+                name="oauth2token_revoked_idx")
+        ]
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.is_signed():
+            self.id = OAuth2TokenSigner.get_jti(self.access_token)
+        self.issued_at = int(self.issued_at)
+        self.expires_at = int(self.issued_at + self.expires_in) if self.expires_in else None
+        super().save(*args, **kwargs)
+
+    def is_signed(self):
+        return OAuth2TokenSigner.is_signed(self.access_token)
 
     def check_client(self, client):
         return self.client == client
@@ -49,7 +80,11 @@ class OAuth2Token(UUIDMixin, TokenMixin):
         return self.expires_in
 
     def is_expired(self):
-        return getattr(self, "is_expired_")
+        return self.expires_at is not None and self.expires_at <= time.time()
+
+    def is_refresh_token_expired(self):
+        lifetime = settings.OAUTH2_REFRESH_TOKEN_LIFETIME
+        return lifetime is not None and self.issued_at + lifetime <= time.time()
 
     def is_revoked(self):
         return self.revoked
@@ -2,15 +2,18 @@ from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.mail import send_mail
 from django.db import models
-from django.shortcuts import loader
 
+from base_django_rest_framework.hashers import password_executor
+from base_django_rest_framework.mail import action_email_renderer
 from base_django_rest_framework.managers import UserManager
 from base_django_rest_framework.signing import UserSigner
-from .mixins import UUIDMixin, CreatedAtMixin, UpdatedAtMixin
+from .email import OutboxEmail
+from .fields import AvatarField
+from .mixins import UUIDMixin, CreatedAtMixin, UpdatedAtMixin, DirtyFieldsMixin
 
 
-class User(UUIDMixin, CreatedAtMixin, UpdatedAtMixin, AbstractUser):
-    avatar = models.ImageField(upload_to="users/avatars", blank=True)
+class User(UUIDMixin, CreatedAtMixin, UpdatedAtMixin, DirtyFieldsMixin, AbstractUser):
+    avatar = AvatarField(upload_to="users/avatars", blank=True)
     first_name = models.CharField(max_length=128)
     last_name = models.CharField(max_length=128)
     email = models.EmailField(unique=True)
@@ -23,9 +26,26 @@ class User(UUIDMixin, CreatedAtMixin, UpdatedAtMixin, AbstractUser):
 
     class Meta(AbstractUser.Meta):
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="user_created_at_id_idx")
+        ]
+
+    def set_password(self, raw_password):
+        self.password = password_executor.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        def setter(password):
+            self.set_password(password)
+            self._password = None
+            self.save(update_fields=["password"])
+
+        return password_executor.check_password(raw_password, self.password, setter)
 
     def get_signature(self, **kwargs):
-        return UserSigner.sign({"user": {"id": str(self.id)}, "extra": kwargs})
+        return UserSigner.sign({"user": {"id": str(self.id)}, "extra": kwargs}, self)
 
     def verify(self, is_verified):
         self.is_verified = is_verified
@@ -43,6 +63,14 @@ class User(UUIDMixin, CreatedAtMixin, UpdatedAtMixin, AbstractUser):
         to_email = kwargs.pop("to_email")
         if to_email is None:
             to_email = self.email
+        if settings.EMAIL_OUTBOX:
+            OutboxEmail.objects.enqueue(
+                subject,
+                message,
+                from_email,
+                [f"{self.get_full_name()} <{to_email}>"],
+                html_message=kwargs.get("html_message"))
+            return
         send_mail(
             subject,
             message,
@@ -53,12 +81,8 @@ class User(UUIDMixin, CreatedAtMixin, UpdatedAtMixin, AbstractUser):
     def send_action_email(self, subject, context, to_email=None):
         context.setdefault("theme", "")
         context.update({"title": subject, "user": self.get_short_name()})
-        self.email_user(
-            subject,
-            loader.render_to_string("base_django_rest_framework/action.txt", context),
-            html_message=loader.render_to_string("base_django_rest_framework/action.html", context),
-            to_email=to_email
-        )
+        message, html_message = action_email_renderer.render(context)
+        self.email_user(subject, message, html_message=html_message, to_email=to_email)
 
     def send_email_confirmation_link(self, email=None):
         if email is None:
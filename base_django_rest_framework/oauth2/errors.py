@@ -0,0 +1,13 @@
+from authlib.oauth2 import OAuth2Error
+
+
+class TooManyLoginAttemptsError(OAuth2Error):
+    error = "access_denied"
+    status_code = 429
+
+    def __init__(self, retry_after, **kwargs):
+        super().__init__(f"Too many failed login attempts, try again in {retry_after} seconds.", **kwargs)
+        self.retry_after = retry_after
+
+    def get_headers(self):
+        return [*super().get_headers(), ("Retry-After", str(self.retry_after))]
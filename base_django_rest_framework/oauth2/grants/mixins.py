@@ -0,0 +1,14 @@
+from base_django_rest_framework.serializers import OAuth2TokenSerializer
+
+
+class TokenResponseMixin:
+    token = None
+
+    def save_token(self, token):
+        self.token = super().save_token(token)
+        self.token.client = self.request.client
+        return self.token
+
+    def create_token_response(self):
+        status_code, body, headers = super().create_token_response()
+        return status_code, OAuth2TokenSerializer(self.token).data, headers
@@ -1,21 +1,34 @@
 from authlib.oauth2.rfc6749.grants import ResourceOwnerPasswordCredentialsGrant
 from django.contrib.auth import get_user_model
+from rest_framework.throttling import BaseThrottle
 
-from base_django_rest_framework.models import OAuth2Token
-from base_django_rest_framework.serializers import OAuth2TokenSerializer
+from base_django_rest_framework.caches import login_guard
+from ..errors import TooManyLoginAttemptsError
+from .mixins import TokenResponseMixin
 
 
-class PasswordGrant(ResourceOwnerPasswordCredentialsGrant):
+class PasswordGrant(TokenResponseMixin, ResourceOwnerPasswordCredentialsGrant):
     TOKEN_ENDPOINT_AUTH_METHODS = ["none"]
 
+    def get_ip(self):
+        return BaseThrottle().get_ident(self.request._request)
+
+    def validate_token_request(self):
+        username = self.request.form.get("username")
+        if username is not None:
+            retry_after = login_guard.check(username, self.get_ip())
+            if retry_after > 0:
+                raise TooManyLoginAttemptsError(retry_after)
+        super().validate_token_request()
+
     def authenticate_user(self, username, password):
         try:
             user = get_user_model().objects.get_by_natural_key(username)
+        except get_user_model().DoesNotExist:
+            get_user_model()().set_password(password)
+        else:
             if user.check_password(password):
+                login_guard.succeed(username)
                 return user
-        except get_user_model().DoesNotExist:
-            return None
-
-    def create_token_response(self):
-        status_code, body, headers = super().create_token_response()
-        return status_code, OAuth2TokenSerializer(OAuth2Token.objects.get(**body)).data, headers
+        login_guard.fail(username, self.get_ip())
+        return None
@@ -1,27 +1,40 @@
+from authlib.oauth2.rfc6749 import InvalidGrantError
 from authlib.oauth2.rfc6749.grants import RefreshTokenGrant as _RefreshTokenGrant
+from django.db import transaction
 
 from base_django_rest_framework.models import OAuth2Token
-from base_django_rest_framework.serializers import OAuth2TokenSerializer
+from base_django_rest_framework.signals import tokens_revoked
+from .mixins import TokenResponseMixin
 
 
-class RefreshTokenGrant(_RefreshTokenGrant):
+class RefreshTokenGrant(TokenResponseMixin, _RefreshTokenGrant):
     TOKEN_ENDPOINT_AUTH_METHODS = ["none"]
     INCLUDE_NEW_REFRESH_TOKEN = True
 
     def authenticate_refresh_token(self, refresh_token):
         try:
-            token = OAuth2Token.objects.get(refresh_token=refresh_token)
-            if not token.revoked:
-                return token
+            token = OAuth2Token.objects.select_related("user").get(refresh_token=refresh_token)
         except OAuth2Token.DoesNotExist:
             return None
+        if token.revoked:
+            OAuth2Token.objects.filter(family=token.family).revoke()
+            return None
+        if token.is_refresh_token_expired():
+            return None
+        return token
 
     def authenticate_user(self, credential):
         return credential.user
 
+    def save_token(self, token):
+        return super().save_token({**token, "family": self.request.refresh_token.family})
+
     def revoke_old_credential(self, credential):
-        credential.revoke()
+        if not OAuth2Token.objects.filter(pk=credential.pk, revoked=False).update(revoked=True):
+            raise InvalidGrantError("Refresh token has already been used.")
+        credential.revoked = True
+        tokens_revoked.send(sender=OAuth2Token, tokens=[credential])
 
     def create_token_response(self):
-        status_code, body, headers = super().create_token_response()
-        return status_code, OAuth2TokenSerializer(OAuth2Token.objects.get(**body)).data, headers
+        with transaction.atomic():
+            return super().create_token_response()
@@ -0,0 +1,3 @@
+from .estimated import EstimatedCountPagination, EstimatedCountPaginator
+from .keyset import KeysetPagination
+from .limit_offset import LimitOffsetPagination
@@ -0,0 +1,66 @@
+from django.core.paginator import Paginator
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.response import Response
+
+from base_django_rest_framework.caches import count_cache
+from .limit_offset import LimitOffsetPagination
+
+
+class EstimatedCountPagination(LimitOffsetPagination):
+    estimated = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.offset = self.get_offset(request)
+        self.count, self.estimated = count_cache.get(queryset)
+        return self.get_page(list(queryset[self.offset:self.offset + self.limit + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.offset = self.get_offset(request)
+        self.count, self.estimated = await count_cache.aget(queryset)
+        return self.get_page([obj async for obj in queryset[self.offset:self.offset + self.limit + 1]])
+
+    def get_page(self, rows):
+        page = rows[:self.limit]
+        if len(rows) > self.limit:
+            self.count = max(self.count, self.offset + len(rows))
+        elif page or not self.offset:
+            self.count, self.estimated = self.offset + len(page), False
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+        return page
+
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.count,
+            "estimated": self.estimated,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["estimated"] = {"type": "boolean", "example": False}
+        return response_schema
+
+
+class EstimatedCountPaginator(Paginator):
+    estimated = False
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        count, self.estimated = count_cache.get(self.object_list)
+        return count
@@ -0,0 +1,215 @@
+import datetime
+import uuid
+from functools import reduce
+
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Q
+from django.db.models.query import ModelIterable, ValuesIterable, ValuesListIterable
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from base_django_rest_framework.caches import count_cache
+
+
+class KeysetPagination(BasePagination):
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "limit"
+    page_size_query_description = _("Number of results to return per page.")
+    max_page_size = None
+    cursor_query_param = "cursor"
+    cursor_query_description = _("The pagination cursor value.")
+    count_query_param = "count"
+    count_query_description = _("Include the total number of results.")
+    cursor_salt = "base_django_rest_framework.pagination.keyset"
+    invalid_cursor_message = _("Invalid cursor")
+    ordering = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset, reverse = self.prepare(queryset, request, view)
+        if page_queryset is None:
+            return None
+        rows = list(page_queryset[:self.page_size + 1])
+        self.count, self.estimated = count_cache.get(queryset) if self.include_count else (None, False)
+        return self.get_page(rows, reverse)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        page_queryset, reverse = self.prepare(queryset, request, view)
+        if page_queryset is None:
+            return None
+        rows = [row async for row in page_queryset[:self.page_size + 1]]
+        self.count, self.estimated = await count_cache.aget(queryset) if self.include_count else (None, False)
+        return self.get_page(rows, reverse)
+
+    def prepare(self, queryset, request, view):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if self.page_size is None:
+            return None, False
+
+        self.include_count = request.query_params.get(self.count_query_param, "").lower() in ("1", "true")
+        self.keys = self.get_ordering(queryset, view)
+        queryset, self.get_key_values = self.get_keyed_queryset(queryset)
+        self.cursor = self.decode_cursor(request)
+
+        values, reverse = self.cursor or (None, False)
+        ordering = [self.invert(key) for key in self.keys] if reverse else list(self.keys)
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self.get_filter(ordering, values))
+        return queryset, reverse
+
+    def get_page(self, rows, reverse):
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+        self.has_next = has_more if not reverse else self.cursor is not None
+        self.has_previous = has_more if reverse else self.cursor is not None
+        self.first = self.get_key_values(rows[0]) if rows else None
+        self.last = self.get_key_values(rows[-1]) if rows else None
+        if not rows and self.cursor is not None:
+            values, reverse = self.cursor
+            self.first = self.last = values
+            self.has_next, self.has_previous = reverse, not reverse
+        return rows
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                return _positive_int(request.query_params[self.page_size_query_param], strict=True,
+                                     cutoff=self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_ordering(self, queryset, view):
+        ordering = getattr(view, "keyset_ordering", None) or self.ordering
+        if ordering is None:
+            ordering = list(queryset.model._meta.ordering)
+            if not ordering:
+                raise ImproperlyConfigured(
+                    f"{type(self).__name__} requires an ordering on {queryset.model.__name__} or a keyset_ordering "
+                    f"on the view.")
+            pk = queryset.model._meta.pk.name
+            if self.get_name(ordering[-1]) != pk:
+                ordering.append(f"-{pk}" if ordering[-1].startswith("-") else pk)
+        return tuple(ordering)
+
+    @staticmethod
+    def get_name(key):
+        return key[1:] if key.startswith("-") else key
+
+    @staticmethod
+    def invert(key):
+        return key[1:] if key.startswith("-") else f"-{key}"
+
+    def get_keyed_queryset(self, queryset):
+        names = [self.get_name(key) for key in self.keys]
+        if queryset._iterable_class is ModelIterable:
+            attnames = [queryset.model._meta.get_field(name).attname for name in names]
+            return queryset, lambda row: [getattr(row, attname) for attname in attnames]
+        fields = list(queryset._fields or [field.attname for field in queryset.model._meta.concrete_fields])
+        fields.extend(name for name in names if name not in fields)
+        if queryset._iterable_class is ValuesIterable:
+            return queryset.values(*fields), lambda row: [row[name] for name in names]
+        if queryset._iterable_class is ValuesListIterable:
+            indexes = [fields.index(name) for name in names]
+            return queryset.values_list(*fields), lambda row: [row[index] for index in indexes]
+        raise ImproperlyConfigured(f"{type(self).__name__} cannot paginate flat or named values_list() querysets.")
+
+    def get_filter(self, ordering, values):
+        conditions = []
+        for position, key in enumerate(ordering):
+            lookup = "lt" if key.startswith("-") else "gt"
+            condition = Q(**{f"{self.get_name(key)}__{lookup}": values[position]})
+            for previous, value in zip(ordering[:position], values):
+                condition &= Q(**{self.get_name(previous): value})
+            conditions.append(condition)
+        first = ordering[0]
+        leading = Q(**{f"{self.get_name(first)}__{'lte' if first.startswith('-') else 'gte'}": values[0]})
+        return leading & reduce(lambda left, right: left | right, conditions)
+
+    def get_cursor_salt(self):
+        return f"{self.cursor_salt}:{','.join(self.keys)}"
+
+    def encode_cursor(self, values, reverse):
+        values = [value.isoformat() if isinstance(value, (datetime.date, datetime.time)) else
+                  str(value) if isinstance(value, uuid.UUID) else value for value in values]
+        cursor = signing.dumps([values, int(reverse)], salt=self.get_cursor_salt())
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            values, reverse = signing.loads(cursor, salt=self.get_cursor_salt())
+        except (signing.BadSignature, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.keys):
+            raise NotFound(self.invalid_cursor_message)
+        return values, bool(reverse)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.last, False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.first, True)
+
+    def get_paginated_response(self, data):
+        response = {"next": self.get_next_link(), "previous": self.get_previous_link()}
+        if self.count is not None:
+            response["count"] = self.count
+            response["estimated"] = self.estimated
+        response["results"] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "count": {"type": "integer", "example": 123},
+                "estimated": {"type": "boolean", "example": False},
+                "results": schema
+            }
+        }
+
+    def get_schema_operation_parameters(self, view):
+        parameters = [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.cursor_query_description),
+                "schema": {"type": "string"}
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.count_query_description),
+                "schema": {"type": "boolean"}
+            }
+        ]
+        if self.page_size_query_param is not None:
+            parameters.append({
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.page_size_query_description),
+                "schema": {"type": "integer"}
+            })
+        return parameters
@@ -0,0 +1,21 @@
+from rest_framework.pagination import LimitOffsetPagination as _LimitOffsetPagination
+
+
+class LimitOffsetPagination(_LimitOffsetPagination):
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.count = await self.aget_count(queryset)
+        self.offset = self.get_offset(request)
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+
+        if self.count == 0 or self.offset > self.count:
+            return []
+        return [obj async for obj in queryset[self.offset:self.offset + self.limit]]
+
+    async def aget_count(self, queryset):
+        return await queryset.acount()
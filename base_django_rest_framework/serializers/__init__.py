@@ -1,3 +1,5 @@
+from .compiled import CompiledSerializer
+from .fields import AvatarField
 from .oauth2 import OAuth2ClientSerializer, OAuth2TokenSerializer
 from .user import (UserSerializer, UserUpdateSerializer, UserUpdateEmailSerializer, UserUpdateActiveStatusSerializer,
                    UserUpdateAdminStatusSerializer, UserUpdatePasswordSerializer)
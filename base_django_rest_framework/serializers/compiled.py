@@ -0,0 +1,122 @@
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from django.db.models.fields.files import FieldFile
+from django.utils import timezone
+from rest_framework import ISO_8601
+from rest_framework.fields import SerializerMethodField, DateTimeField
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.settings import api_settings
+
+
+class CompiledRow:
+    def __init__(self, pk_attname, values):
+        self.__dict__.update(values)
+        self.pk = values[pk_attname]
+
+
+class CompiledSerializer:
+    def __init__(self, serializer):
+        self.serializer = serializer
+        self.model = serializer.Meta.model
+        self.columns = []
+        self.steps = []
+        self.row_columns = None
+        for field in serializer.fields.values():
+            if not field.write_only:
+                self.compile_field(field)
+
+    def add_columns(self, *lookups):
+        indexes = []
+        for lookup in lookups:
+            if lookup not in self.columns:
+                self.columns.append(lookup)
+            indexes.append(self.columns.index(lookup))
+        return indexes
+
+    def get_model_field(self, field):
+        try:
+            return self.model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            raise ImproperlyConfigured(
+                f"{type(self.serializer).__name__}.{field.field_name} cannot be compiled, its source "
+                f"'{field.source}' is not a model field.")
+
+    def compile_field(self, field):
+        if hasattr(field, "compiled_columns"):
+            indexes = self.add_columns(*field.compiled_columns)
+            self.steps.append((field.field_name, indexes, self.compile_custom(field)))
+        elif isinstance(field, SerializerMethodField):
+            if self.row_columns is None:
+                self.row_columns = [(model_field.attname, model_field, self.add_columns(model_field.attname)[0])
+                                    for model_field in self.model._meta.concrete_fields]
+            self.steps.append((field.field_name, None, getattr(self.serializer, field.method_name)))
+        else:
+            model_field = self.get_model_field(field)
+            if model_field.is_relation and not isinstance(field, PrimaryKeyRelatedField):
+                raise ImproperlyConfigured(
+                    f"{type(self.serializer).__name__}.{field.field_name} cannot be compiled, only primary key "
+                    f"relations are supported.")
+            indexes = self.add_columns(model_field.attname)
+            self.steps.append((field.field_name, indexes, self.compile_model_field(field, model_field)))
+
+    def compile_custom(self, field):
+        def represent(*values):
+            if all(value is None for value in values):
+                return None
+            return field.to_compiled_representation(*values)
+
+        return represent
+
+    def compile_model_field(self, field, model_field):
+        if isinstance(model_field, models.FileField):
+            return lambda value: field.to_representation(FieldFile(None, model_field, value))
+        if isinstance(field, PrimaryKeyRelatedField):
+            if field.pk_field is None:
+                return lambda value: value
+            return field.pk_field.to_representation
+        if isinstance(field, DateTimeField):
+            return self.compile_datetime_field(field)
+        return field.to_representation
+
+    def compile_datetime_field(self, field):
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+        if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+            return field.to_representation
+
+        def represent(value):
+            if isinstance(value, str) or not timezone.is_aware(value):
+                return field.to_representation(value)
+            try:
+                value = value.astimezone(field_timezone).isoformat()
+            except OverflowError:
+                return field.to_representation(value)
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+        return represent
+
+    def get_row(self, values):
+        row = {}
+        for attname, model_field, index in self.row_columns:
+            value = values[index]
+            row[attname] = FieldFile(None, model_field, value) if isinstance(model_field, models.FileField) else value
+        return CompiledRow(self.model._meta.pk.attname, row)
+
+    def get_queryset(self, queryset):
+        return queryset.values_list(*self.columns)
+
+    def to_representation(self, values):
+        row = None if self.row_columns is None else self.get_row(values)
+        data = {}
+        for name, indexes, represent in self.steps:
+            if indexes is None:
+                data[name] = represent(row)
+            elif len(indexes) == 1:
+                value = values[indexes[0]]
+                data[name] = None if value is None else represent(value)
+            else:
+                data[name] = represent(*[values[index] for index in indexes])
+        return data
+
+    def represent(self, rows):
+        return [self.to_representation(values) for values in rows]
@@ -0,0 +1,6 @@
+from rest_framework.fields import FileField, ImageField
+
+
+class AvatarField(ImageField):
+    def to_internal_value(self, data):
+        return FileField.to_internal_value(self, data)
@@ -1,11 +1,57 @@
-from rest_framework.serializers import ModelSerializer as _ModelSerializer
+import copy
+
+from rest_framework.fields import DictField, ListField
+from rest_framework.relations import ManyRelatedField
+from rest_framework.serializers import BaseSerializer, ModelSerializer as _ModelSerializer
+
+from base_django_rest_framework import models
+from .fields import AvatarField
 
 
 class ModelSerializer(_ModelSerializer):
+    serializer_field_mapping = {
+        **_ModelSerializer.serializer_field_mapping,
+        models.AvatarField: AvatarField
+    }
+    exclude_fields = ()
+    field_subset = None
+    subset_classes = {}
+
+    def __new__(cls, *args, fields=None, **kwargs):
+        if fields:
+            cls = cls.get_subset_class(fields)
+        return super().__new__(cls, *args, **kwargs)
+
     def __init__(self, *args, fields=None, **kwargs):
         super().__init__(*args, **kwargs)
-        if fields:
-            allowed = set(fields)
-            existing = set(self.fields.keys())
-            for field in existing - allowed:
-                self.fields.pop(field)
+
+    @classmethod
+    def get_subset_class(cls, fields):
+        key = (cls, frozenset(fields))
+        subset_class = cls.subset_classes.get(key)
+        if subset_class is None:
+            subset_class = type(cls)(cls.__name__, (cls,), {
+                "__module__": cls.__module__,
+                "__qualname__": cls.__qualname__,
+                "field_subset": key[1]
+            })
+            subset_class = cls.subset_classes.setdefault(key, subset_class)
+        return subset_class
+
+    def get_fields(self):
+        cls = type(self)
+        fields = cls.__dict__.get("_prototype_fields")
+        if fields is None:
+            fields = {
+                name: field
+                for name, field in super().get_fields().items()
+                if name not in cls.exclude_fields and (cls.field_subset is None or name in cls.field_subset)
+            }
+            cls._prototype_fields = fields
+        return {name: self.copy_field(field) for name, field in fields.items()}
+
+    @staticmethod
+    def copy_field(field):
+        if isinstance(field, (BaseSerializer, ListField, DictField, ManyRelatedField)):
+            return copy.deepcopy(field)
+        return copy.copy(field)
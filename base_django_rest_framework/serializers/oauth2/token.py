@@ -9,9 +9,16 @@ class ClientField(Field):
         pass
 
     def to_representation(self, value):
+        return self.to_compiled_representation(value.client_id, value.client_name)
+
+    @property
+    def compiled_columns(self):
+        return [f"{self.source}__client_id", f"{self.source}__client_name"]
+
+    def to_compiled_representation(self, client_id, client_name):
         return {
-            "client_id": value.client_id,
-            "client_name": value.client_name
+            "client_id": client_id,
+            "client_name": client_name
         }
 
 
@@ -1,11 +1,14 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth import password_validation
+from rest_framework.fields import SerializerMethodField
 
+from base_django_rest_framework.images import avatar_processor
 from .model import ModelSerializer
 
 _fields = [
     "id",
     "avatar",
+    "avatar_variants",
     "first_name",
     "last_name",
     "username",
@@ -33,6 +36,20 @@ _write_only_fields = ["password"]
 
 
 class UserSerializer(ModelSerializer):
+    avatar_variants = SerializerMethodField()
+
+    def get_avatar_variants(self, user):
+        if not user.avatar:
+            return None
+        variants = avatar_processor.get_variant_urls(user.avatar.storage, user.avatar.name)
+        request = self.context.get("request")
+        if variants is None or request is None:
+            return variants
+        return {
+            size: {variant_format: request.build_absolute_uri(url) for variant_format, url in urls.items()}
+            for size, urls in variants.items()
+        }
+
     def validate_password(self, value):
         user = self.instance
         if user is None:
@@ -50,9 +67,7 @@ class UserSerializer(ModelSerializer):
 
 
 class UserUpdateSerializer(UserSerializer):
-    def __init__(self, *args, fields=None, **kwargs):
-        super().__init__(*args, fields=fields, **kwargs)
-        self.fields.pop("password")
+    exclude_fields = ("password",)
 
     class Meta(UserSerializer.Meta):
         read_only_fields = [*_readonly_fields, "email"]
@@ -1,3 +1,8 @@
-from .oauth2 import delete_token
-from .user import (send_email_verification_link, delete_orphaned_avatar, delete_avatar, revoke_tokens, email_changed,
-                   password_changed)
+from .count import invalidate_cached_counts, invalidate_counts
+from .email import reset_action_email_templates
+from .oauth2 import (delete_token, invalidate_cached_token, invalidate_cached_tokens, invalidate_cached_client_tokens,
+                     invalidate_tokens, tokens_revoked)
+from .permission import (invalidate_user_permissions, invalidate_group_permissions, invalidate_deleted_permissions,
+                         invalidate_user_status_permissions)
+from .user import (send_email_verification_link, delete_orphaned_avatar, process_avatar, delete_avatar, revoke_tokens,
+                   invalidate_cached_user_tokens, invalidate_deleted_user_tokens, email_changed, password_changed)
@@ -0,0 +1,20 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from base_django_rest_framework.caches import count_cache
+from base_django_rest_framework.models import OAuth2Client, OAuth2Token
+
+
+@receiver(post_save, sender=get_user_model(), dispatch_uid="invalidate cached user counts on create")
+@receiver(post_save, sender=OAuth2Client, dispatch_uid="invalidate cached oAuth2 client counts on create")
+@receiver(post_save, sender=OAuth2Token, dispatch_uid="invalidate cached oAuth2 token counts on create")
+def invalidate_cached_counts(sender, created, **kwargs):
+    if created:
+        invalidate_counts(sender)
+
+
+def invalidate_counts(model):
+    count_cache.invalidate(model)
+    transaction.on_commit(lambda: count_cache.invalidate(model))
@@ -0,0 +1,10 @@
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from base_django_rest_framework.mail import action_email_renderer
+
+
+@receiver(setting_changed, dispatch_uid="reset action email templates")
+def reset_action_email_templates(sender, setting, **kwargs):
+    if setting == "TEMPLATES":
+        action_email_renderer.reset()
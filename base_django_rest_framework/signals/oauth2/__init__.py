@@ -1 +1,2 @@
-from .token import delete_token
+from .client import invalidate_cached_client_tokens
+from .token import delete_token, invalidate_cached_token, invalidate_cached_tokens, invalidate_tokens, tokens_revoked
@@ -0,0 +1,10 @@
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from base_django_rest_framework.models import OAuth2Client
+from .token import invalidate_tokens
+
+
+@receiver(pre_delete, sender=OAuth2Client, dispatch_uid="invalidate cached oAuth2 client tokens")
+def invalidate_cached_client_tokens(sender, instance, **kwargs):
+    invalidate_tokens(instance.tokens.only("id", "access_token", "expires_at"))
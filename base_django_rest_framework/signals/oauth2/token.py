@@ -1,11 +1,37 @@
 from authlib.integrations.django_oauth2 import AuthorizationServer
 from authlib.integrations.django_oauth2 import token_revoked
+from django.dispatch import Signal
 from django.dispatch import receiver
 
+from base_django_rest_framework.caches import token_cache, revocation_list
 from base_django_rest_framework.models import OAuth2Token
+from base_django_rest_framework.signing import OAuth2TokenSigner
+
+tokens_revoked = Signal()
+
+
+def invalidate_tokens(tokens):
+    tokens = list(tokens)
+    token_cache.delete(*[token.access_token for token in tokens])
+    revocation_list.add(*[
+        (token.id, token.expires_at or 0)
+        for token in tokens if OAuth2TokenSigner.is_signed(token.access_token)
+    ])
+
+
+@receiver(token_revoked, sender=OAuth2Token, dispatch_uid="invalidate cached token revoked through refresh")
+@receiver(token_revoked, sender=AuthorizationServer,
+          dispatch_uid="invalidate cached token revoked through revocation endpoint")
+def invalidate_cached_token(sender, token, **kwargs):
+    invalidate_tokens([token])
 
 
 @receiver(token_revoked, sender=OAuth2Token, dispatch_uid="delete token revoked through refresh")
 @receiver(token_revoked, sender=AuthorizationServer, dispatch_uid="delete token revoked through revocation endpoint")
 def delete_token(sender, token, **kwargs):
     token.delete()
+
+
+@receiver(tokens_revoked, sender=OAuth2Token, dispatch_uid="invalidate cached tokens revoked in bulk")
+def invalidate_cached_tokens(sender, tokens, **kwargs):
+    invalidate_tokens(tokens)
@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver
+
+from base_django_rest_framework.caches import permission_cache
+
+
+def invalidate_permissions(*user_ids):
+    permission_cache.invalidate(*user_ids)
+    transaction.on_commit(lambda: permission_cache.invalidate(*user_ids))
+
+
+def invalidate_all_permissions():
+    permission_cache.invalidate_all()
+    transaction.on_commit(permission_cache.invalidate_all)
+
+
+@receiver(m2m_changed, sender=get_user_model().user_permissions.through,
+          dispatch_uid="invalidate cached permissions on user permissions change")
+@receiver(m2m_changed, sender=get_user_model().groups.through,
+          dispatch_uid="invalidate cached permissions on user groups change")
+def invalidate_user_permissions(sender, instance, action, reverse, pk_set=None, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        invalidate_permissions(instance.pk)
+    elif pk_set:
+        invalidate_permissions(*pk_set)
+    else:
+        invalidate_all_permissions()
+
+
+@receiver(m2m_changed, sender=Group.permissions.through, dispatch_uid="invalidate cached permissions on group change")
+def invalidate_group_permissions(sender, action, **kwargs):
+    if action.startswith("post_"):
+        invalidate_all_permissions()
+
+
+@receiver(post_delete, sender=Group, dispatch_uid="invalidate cached permissions on group delete")
+@receiver(post_delete, sender=Permission, dispatch_uid="invalidate cached permissions on permission delete")
+def invalidate_deleted_permissions(sender, **kwargs):
+    invalidate_all_permissions()
+
+
+@receiver(post_save, sender=get_user_model(), dispatch_uid="invalidate cached permissions on user status change")
+def invalidate_user_status_permissions(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    if created or raw or (update_fields is not None and not {"is_active", "is_superuser"} & set(update_fields)):
+        return
+    if {"is_active", "is_superuser"} & instance.get_dirty_fields().keys():
+        invalidate_permissions(instance.pk)
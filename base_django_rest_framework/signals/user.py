@@ -1,34 +1,64 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import pre_save, post_save, post_delete
+from django.db.models.signals import post_save, pre_delete, post_delete
 from django.dispatch import Signal
 from django.dispatch import receiver
 
+from base_django_rest_framework.caches import token_cache
+from base_django_rest_framework.images import avatar_processor
+from .oauth2 import invalidate_tokens
+
 email_changed = Signal()
 password_changed = Signal()
 
 
 @receiver(post_save, sender=get_user_model(), dispatch_uid="send user email verification link")
-def send_email_verification_link(sender, instance, created=False, **kwargs):
-    if created:
+def send_email_verification_link(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
         instance.send_email_confirmation_link()
 
 
-@receiver(pre_save, sender=get_user_model(), dispatch_uid="delete user orphaned avatar from storage")
-def delete_orphaned_avatar(sender, instance, **kwargs):
-    try:
-        with get_user_model().objects.get(id=instance.id).avatar as old_avatar:
-            if instance.avatar != old_avatar:
-                old_avatar.delete(False)
-    except get_user_model().DoesNotExist:
+@receiver(post_save, sender=get_user_model(), dispatch_uid="delete user orphaned avatar from storage")
+def delete_orphaned_avatar(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    if created or raw or (update_fields is not None and "avatar" not in update_fields):
+        return
+    old_avatar = instance.get_dirty_fields().get("avatar")
+    if old_avatar and old_avatar != instance.avatar.name and not sender.objects.filter(avatar=old_avatar).exists():
+        avatar_processor.schedule(
+            avatar_processor.delete, instance.avatar.storage, old_avatar, using=instance._state.db)
+
+
+@receiver(post_save, sender=get_user_model(), dispatch_uid="process user avatar variants")
+def process_avatar(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not instance.avatar or (update_fields is not None and "avatar" not in update_fields):
         return
+    if "avatar" in instance.get_dirty_fields():
+        avatar_processor.schedule(
+            avatar_processor.generate, instance.avatar.storage, instance.avatar.name, using=instance._state.db)
 
 
 @receiver(post_delete, sender=get_user_model(), dispatch_uid="delete user avatar from storage")
 def delete_avatar(sender, instance, **kwargs):
-    instance.avatar.delete(False)
+    if instance.avatar and not sender.objects.filter(avatar=instance.avatar.name).exists():
+        avatar_processor.schedule(
+            avatar_processor.delete, instance.avatar.storage, instance.avatar.name, using=instance._state.db)
 
 
 @receiver([email_changed, password_changed], sender=get_user_model(), dispatch_uid="revoke all user tokens")
 def revoke_tokens(sender, instance, **kwargs):
-    for token in instance.tokens.all():
-        token.revoke()
+    instance.tokens.revoke()
+
+
+@receiver(post_save, sender=get_user_model(), dispatch_uid="invalidate user cached tokens on update")
+def invalidate_cached_user_tokens(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    if not created and not raw and (update_fields is None or "is_active" in update_fields):
+        tokens = instance.tokens.only("id", "access_token", "expires_at")
+        if instance.is_active:
+            tokens = [token for token in tokens if not token.is_signed()]
+        invalidate_tokens(tokens)
+        token_cache.delete_user(instance.pk)
+
+
+@receiver(pre_delete, sender=get_user_model(), dispatch_uid="invalidate user cached tokens on delete")
+def invalidate_deleted_user_tokens(sender, instance, **kwargs):
+    invalidate_tokens(instance.tokens.only("id", "access_token", "expires_at"))
+    token_cache.delete_user(instance.pk)
@@ -1 +1,2 @@
+from .oauth2 import OAuth2TokenSigner
 from .user import UserSigner
@@ -0,0 +1 @@
+from .token import OAuth2TokenSigner
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.signing import Signer, BadSignature
+
+
+class OAuth2TokenSigner:
+    separator = ":"
+
+    @staticmethod
+    def get_signer():
+        conf = settings.OAUTH2_SIGNED_TOKEN
+        return Signer(key=conf.get("key") or settings.SECRET_KEY, salt=conf["salt"], algorithm="sha256")
+
+    @classmethod
+    def is_signed(cls, token):
+        return cls.separator in token
+
+    @classmethod
+    def sign(cls, claims):
+        return cls.get_signer().sign_object(claims)
+
+    @classmethod
+    def unsign(cls, token):
+        claims = cls.get_signer().unsign_object(token)
+        if not isinstance(claims, dict) or not {"jti", "sub", "cid", "scope", "iat", "exp"} <= claims.keys():
+            raise BadSignature("Malformed token claims.")
+        return claims
+
+    @classmethod
+    def get_jti(cls, token):
+        return cls.get_signer().unsign_object(token)["jti"]
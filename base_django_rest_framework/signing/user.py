@@ -1,16 +1,66 @@
+import secrets
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from django.core.signing import dumps, loads, BadSignature
+from django.utils.crypto import salted_hmac, constant_time_compare
 
 
 class UserSigner:
     @staticmethod
-    def sign(data):
-        return dumps(data)
+    def get_conf():
+        return settings.USER_SIGNATURE
 
-    @staticmethod
-    def unsign(signature, max_age):
-        data = loads(signature, max_age=max_age)
+    @classmethod
+    def get_cache(cls):
+        return caches[cls.get_conf()["cache"]]
+
+    @classmethod
+    def get_key(cls, nonce):
+        return f"{cls.get_conf()['salt']}:nonce:{nonce}"
+
+    @classmethod
+    def get_state(cls, user):
+        value = f"{user.pk}{user.password}{user.email}"
+        return salted_hmac(cls.get_conf()["salt"], value, algorithm="sha256").hexdigest()[:32]
+
+    @classmethod
+    def sign(cls, data, user=None):
+        conf = cls.get_conf()
+        data = {**data}
+        if conf["single_use"]:
+            data["nonce"] = secrets.token_urlsafe(12)
+        if user is not None:
+            data["state"] = cls.get_state(user)
+        return dumps(data, salt=conf["salt"])
+
+    @classmethod
+    def loads(cls, signature, max_age, consume=True):
+        conf = cls.get_conf()
+        data = loads(signature, salt=conf["salt"], max_age=max_age)
+        if conf["single_use"]:
+            if "nonce" not in data:
+                raise BadSignature("Signature is not single-use.")
+            key = cls.get_key(data["nonce"])
+            if consume:
+                if not cls.get_cache().add(key, True, max_age):
+                    raise BadSignature("Signature has already been used.")
+            elif cls.get_cache().get(key) is not None:
+                raise BadSignature("Signature has already been used.")
+        return data
+
+    @classmethod
+    def unsign(cls, signature, max_age, consume=True):
+        data = cls.loads(signature, max_age, consume)
         try:
-            return get_user_model().objects.get(**data["user"]), data.get("extra", {})
+            user = get_user_model().objects.get(**data["user"])
         except get_user_model().DoesNotExist:
             raise BadSignature()
+        if "state" in data and not constant_time_compare(data["state"], cls.get_state(user)):
+            raise BadSignature("Signature is no longer valid.")
+        return user, data.get("extra", {})
+
+    @classmethod
+    def consume(cls, signature, max_age):
+        cls.loads(signature, max_age, True)
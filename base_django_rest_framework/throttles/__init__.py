@@ -1,2 +1,3 @@
 from .oauth2 import CreateOAuth2TokenRateThrottle
+from .rate import SlidingWindowRateThrottle, AnonRateThrottle, UserRateThrottle, ScopedRateThrottle
 from .user import CreateUserRateThrottle, EmailUserRateThrottle
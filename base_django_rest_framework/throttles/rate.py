@@ -0,0 +1,119 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from rest_framework import throttling
+
+
+class SlidingWindowRateThrottle(throttling.SimpleRateThrottle):
+    script = """
+        local previous = tonumber(redis.call("GET", KEYS[1]) or "0")
+        local current = tonumber(redis.call("GET", KEYS[2]) or "0")
+        if previous * tonumber(ARGV[2]) + current >= tonumber(ARGV[1]) then
+            return {0, previous, current}
+        end
+        current = redis.call("INCR", KEYS[2])
+        if current == 1 then
+            redis.call("EXPIRE", KEYS[2], ARGV[3])
+        end
+        return {1, previous, current - 1}
+    """
+
+    scripts = {}
+    scripts_lock = threading.Lock()
+
+    def get_conf(self, name):
+        conf = settings.THROTTLE
+        return conf.get("scopes", {}).get(self.scope, {}).get(name, conf.get(name))
+
+    def get_cache(self):
+        return caches[self.get_conf("cache")]
+
+    def get_redis_client(self):
+        url = self.get_conf("redis_url")
+        if url is not None:
+            import redis
+
+            return redis.Redis.from_url(url)
+        alias = self.get_conf("cache")
+        cache = caches[alias]
+        if isinstance(cache, RedisCache):
+            return cache._cache.get_client(write=True)
+        if not type(cache).__module__.startswith("django_redis."):
+            return None
+        from django_redis import get_redis_connection
+
+        return get_redis_connection(alias)
+
+    def get_redis_script(self):
+        key = (self.get_conf("redis_url"), self.get_conf("cache"))
+        if key not in self.scripts:
+            with self.scripts_lock:
+                if key not in self.scripts:
+                    client = self.get_redis_client()
+                    self.scripts[key] = client.register_script(self.script) if client is not None else None
+        return self.scripts[key]
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self.now = self.timer()
+        window, self.elapsed = divmod(self.now, self.duration)
+        keys = (f"{self.key}:{int(window) - 1}", f"{self.key}:{int(window)}")
+        script = self.get_redis_script()
+        if script is not None:
+            allowed = self.hit_redis(script, *keys)
+        else:
+            allowed = self.hit_cache(self.get_cache(), *keys)
+        return self.throttle_success() if allowed else self.throttle_failure()
+
+    def get_weight(self):
+        return 1 - self.elapsed / self.duration
+
+    def is_full(self, current):
+        return self.previous * self.get_weight() + current >= self.num_requests
+
+    def hit_redis(self, script, previous_key, current_key):
+        allowed, self.previous, self.current = script(
+            keys=[previous_key, current_key], args=[self.num_requests, self.get_weight(), self.duration * 2])
+        return bool(allowed)
+
+    def hit_cache(self, cache, previous_key, current_key):
+        counts = cache.get_many([previous_key, current_key])
+        self.previous, self.current = counts.get(previous_key, 0), counts.get(current_key, 0)
+        if self.is_full(self.current):
+            return False
+        try:
+            count = cache.incr(current_key)
+        except ValueError:
+            count = 1 if cache.add(current_key, 1, self.duration * 2) else cache.incr(current_key)
+        self.current = count - 1
+        if self.is_full(self.current):
+            cache.decr(current_key)
+            return False
+        return True
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        remaining = self.duration - self.elapsed
+        if self.current >= self.num_requests or not self.previous:
+            return remaining
+        return max(0.0, remaining - self.duration * (self.num_requests - self.current) / self.previous)
+
+
+class AnonRateThrottle(throttling.AnonRateThrottle, SlidingWindowRateThrottle):
+    pass
+
+
+class UserRateThrottle(throttling.UserRateThrottle, SlidingWindowRateThrottle):
+    pass
+
+
+class ScopedRateThrottle(throttling.ScopedRateThrottle, SlidingWindowRateThrottle):
+    pass
@@ -1,4 +1,4 @@
-from rest_framework.throttling import UserRateThrottle
+from .rate import UserRateThrottle
 
 
 class CreateUserRateThrottle(UserRateThrottle):
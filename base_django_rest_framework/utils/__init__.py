@@ -1 +1 @@
-from .oauth2 import client_id_generator, token_generator
+from .oauth2 import client_id_generator, token_generator, signed_token_generator, OAuth2TokenPartitioner
@@ -1,2 +1,3 @@
 from .client import client_id_generator
-from .token import token_generator
+from .partition import OAuth2TokenPartitioner
+from .token import token_generator, signed_token_generator
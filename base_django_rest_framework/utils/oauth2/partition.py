@@ -0,0 +1,187 @@
+import re
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.apps import apps
+from django.db import connections, transaction
+
+BOUND_PATTERN = re.compile(r"FROM \('?(-?\d+)'?\) TO \('?(-?\d+)'?\)")
+
+
+class OAuth2TokenPartitioner:
+    intervals = ("week", "month")
+    partition_key = "issued_at"
+
+    def __init__(self, interval="month", using="default"):
+        if interval not in self.intervals:
+            raise ValueError(f"Interval must be one of {', '.join(self.intervals)}.")
+        self.interval = interval
+        self.connection = connections[using]
+        self.model = apps.get_model("base_django_rest_framework", "OAuth2Token")
+        self.table = self.model._meta.db_table
+
+    @property
+    def default_partition(self):
+        return f"{self.table}_default"
+
+    @property
+    def key_table(self):
+        return f"{self.table}_keys"
+
+    @property
+    def key_columns(self):
+        return [field.column for field in self.model._meta.concrete_fields if field.primary_key or field.unique]
+
+    def get_range(self, timestamp):
+        moment = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+        if self.interval == "week":
+            start = datetime.combine(
+                moment.date() - timedelta(days=moment.weekday()), datetime.min.time(), timezone.utc)
+            end = start + timedelta(weeks=1)
+        else:
+            start = datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+            end = datetime(moment.year + moment.month // 12, moment.month % 12 + 1, 1, tzinfo=timezone.utc)
+        return int(start.timestamp()), int(end.timestamp())
+
+    def get_partition_name(self, start):
+        moment = datetime.fromtimestamp(start, tz=timezone.utc)
+        if self.interval == "week":
+            year, week, _ = moment.isocalendar()
+            return f"{self.table}_p{year}w{week:02d}"
+        return f"{self.table}_p{moment.year}m{moment.month:02d}"
+
+    def is_partitioned(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [self.table])
+            return cursor.fetchone() is not None
+
+    def get_partitions(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(%s) ORDER BY c.relname",
+                [self.table])
+            partitions = []
+            for name, bound in cursor.fetchall():
+                match = BOUND_PATTERN.search(bound)
+                if match:
+                    partitions.append((name, int(match.group(1)), int(match.group(2))))
+            return partitions
+
+    def create_partition(self, start, end):
+        name = self.get_partition_name(start)
+        quote = self.connection.ops.quote_name
+        with transaction.atomic(using=self.connection.alias), self.connection.cursor() as cursor:
+            cursor.execute(f"CREATE TABLE {quote(name)} (LIKE {quote(self.table)} INCLUDING DEFAULTS)")
+            cursor.execute(
+                f"WITH moved AS (DELETE FROM {quote(self.default_partition)} "
+                f"WHERE {self.partition_key} >= %s AND {self.partition_key} < %s RETURNING *) "
+                f"INSERT INTO {quote(name)} SELECT * FROM moved",
+                [start, end])
+            cursor.execute(
+                f"ALTER TABLE {quote(self.table)} ATTACH PARTITION {quote(name)} FOR VALUES FROM (%s) TO (%s)",
+                [start, end])
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [self.key_table])
+            if cursor.fetchone()[0]:
+                columns = ", ".join(map(quote, self.key_columns))
+                cursor.execute(f"INSERT INTO {quote(self.key_table)} ({columns}) SELECT {columns} FROM {quote(name)}")
+        return name
+
+    def premake(self, count, now=None):
+        now = time.time() if now is None else now
+        existing = [(start, end) for _, start, end in self.get_partitions()]
+        created = []
+        start, end = self.get_range(now)
+        for _ in range(count + 1):
+            if not any(start < other_end and other_start < end for other_start, other_end in existing):
+                created.append(self.create_partition(start, end))
+            start, end = self.get_range(end)
+        return created
+
+    def drop_expired(self, now=None):
+        now = int(time.time() if now is None else now)
+        quote = self.connection.ops.quote_name
+        pk = quote(self.model._meta.pk.column)
+        dropped = []
+        for name, start, end in self.get_partitions():
+            if end > now:
+                continue
+            tokens = self.model.objects.using(self.connection.alias).filter(
+                **{f"{self.partition_key}__gte": start, f"{self.partition_key}__lt": end})
+            purgeable = tokens.filter(expires_at__lte=now).purgeable()
+            with transaction.atomic(using=self.connection.alias), self.connection.cursor() as cursor:
+                if tokens.exclude(pk__in=purgeable.values("pk")).exists():
+                    continue
+                cursor.execute(f"ALTER TABLE {quote(self.table)} DETACH PARTITION {quote(name)}")
+                cursor.execute(
+                    f"DELETE FROM {quote(self.key_table)} WHERE {pk} IN (SELECT {pk} FROM {quote(name)})")
+                cursor.execute(f"DROP TABLE {quote(name)}")
+            dropped.append(name)
+        return dropped
+
+    def convert(self):
+        quote = self.connection.ops.quote_name
+        table, staging = self.table, f"{self.table}_partitioned"
+        with transaction.atomic(using=self.connection.alias), self.connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+            cursor.execute(
+                "SELECT c.conname, c.contype, pg_get_constraintdef(c.oid), "
+                "ARRAY(SELECT a.attname::text FROM unnest(c.conkey) WITH ORDINALITY k(attnum, position) "
+                "JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum ORDER BY k.position) "
+                "FROM pg_constraint c WHERE c.conrelid = to_regclass(%s)",
+                [table])
+            constraints = cursor.fetchall()
+            cursor.execute(
+                "SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i WHERE i.indrelid = to_regclass(%s) "
+                "AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)",
+                [table])
+            indexes = [row[0] for row in cursor.fetchall()]
+            cursor.execute(
+                f"SELECT DISTINCT {self.partition_key} / 86400 * 86400 FROM {quote(table)}")
+            days = [row[0] for row in cursor.fetchall()]
+
+            cursor.execute(
+                f"CREATE TABLE {quote(staging)} (LIKE {quote(table)} INCLUDING DEFAULTS) "
+                f"PARTITION BY RANGE ({self.partition_key})")
+            cursor.execute(f"CREATE TABLE {quote(self.default_partition)} PARTITION OF {quote(staging)} DEFAULT")
+            cursor.execute(f"INSERT INTO {quote(staging)} SELECT * FROM {quote(table)}")
+            cursor.execute(f"DROP TABLE {quote(table)}")
+            cursor.execute(f"ALTER TABLE {quote(staging)} RENAME TO {quote(table)}")
+
+            for start, end in sorted({self.get_range(day) for day in days}):
+                self.create_partition(start, end)
+
+            keys = quote(self.key_table)
+            cursor.execute(
+                f"CREATE TABLE {keys} AS SELECT {', '.join(map(quote, self.key_columns))} FROM {quote(table)}")
+            for name, contype, definition, columns in constraints:
+                if contype in ("p", "u"):
+                    cursor.execute(f"ALTER TABLE {keys} ADD CONSTRAINT {quote(name)} {definition}")
+                    if self.partition_key not in columns:
+                        columns = [*columns, self.partition_key]
+                    definition = "{} ({})".format(
+                        "PRIMARY KEY" if contype == "p" else "UNIQUE", ", ".join(map(quote, columns)))
+                    cursor.execute(f"ALTER TABLE {quote(table)} ADD {definition}")
+                else:
+                    cursor.execute(f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(name)} {definition}")
+            for definition in indexes:
+                cursor.execute(definition)
+            self.create_key_triggers(cursor)
+
+    def create_key_triggers(self, cursor):
+        quote = self.connection.ops.quote_name
+        table, keys, function = quote(self.table), quote(self.key_table), quote(f"{self.key_table}_sync")
+        pk, columns = quote(self.model._meta.pk.column), list(map(quote, self.key_columns))
+        cursor.execute(
+            f"CREATE FUNCTION {function}() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN "
+            f"IF TG_OP = 'TRUNCATE' THEN TRUNCATE {keys}; RETURN NULL; END IF; "
+            f"IF TG_OP <> 'INSERT' THEN DELETE FROM {keys} WHERE {pk} = OLD.{pk}; END IF; "
+            f"IF TG_OP <> 'DELETE' THEN INSERT INTO {keys} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(f'NEW.{column}' for column in columns)}); END IF; "
+            f"RETURN NULL; END $$")
+        cursor.execute(
+            f"CREATE TRIGGER {quote(f'{self.key_table}_rows')} AFTER INSERT OR DELETE OR UPDATE OF "
+            f"{', '.join(columns)} ON {table} FOR EACH ROW EXECUTE FUNCTION {function}()")
+        cursor.execute(
+            f"CREATE TRIGGER {quote(f'{self.key_table}_truncate')} AFTER TRUNCATE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION {function}()")
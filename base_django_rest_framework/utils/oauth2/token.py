@@ -1,5 +1,27 @@
+import time
+import uuid
+
 from authlib.common.security import generate_token
+from authlib.integrations.django_oauth2.authorization_server import create_token_expires_in_generator
+from django.conf import settings
+
+from base_django_rest_framework.signing.oauth2 import OAuth2TokenSigner
 
 
 def token_generator(*args, **kwargs):
     return generate_token(48)
+
+
+def signed_token_generator(client, grant_type, user, scope, **kwargs):
+    expires_in = create_token_expires_in_generator(
+        settings.AUTHLIB_OAUTH2_PROVIDER.get("token_expires_in")
+    )(client, grant_type)
+    issued_at = int(time.time())
+    return OAuth2TokenSigner.sign({
+        "jti": str(uuid.uuid4()),
+        "sub": str(user.pk),
+        "cid": client.client_id,
+        "scope": scope or "",
+        "iat": issued_at,
+        "exp": issued_at + expires_in if expires_in else 0
+    })
@@ -1,9 +1,178 @@
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.http import Http404
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import AND, OR, NOT, AllowAny, IsAuthenticated
 from rest_framework.viewsets import GenericViewSet as _GenericViewSet
 
+from base_django_rest_framework.asgi import is_async_enabled
+
 
 class GenericViewSet(_GenericViewSet):
     lookup_url_converter = None
     field_map = {}
+    action_policies = {}
+    compiled_action_policies = {}
+    action_policy_keys = ("permissions", "throttles", "serializer", "fields", "compiled")
+    async_dispatch = False
+    async_permission_classes = (AllowAny, IsAuthenticated)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.compiled_action_policies = cls.compile_action_policies()
+
+    @classmethod
+    def compile_action_policies(cls):
+        compiled = {}
+        for actions, policy in cls.action_policies.items():
+            permissions = tuple(permission() for permission in policy.get("permissions", ()))
+            for action in (actions,) if isinstance(actions, str) else actions:
+                if not callable(getattr(cls, action, None)):
+                    raise ImproperlyConfigured(f"{cls.__name__}.action_policies references unknown action '{action}'.")
+                unknown = policy.keys() - set(cls.action_policy_keys)
+                if unknown:
+                    raise ImproperlyConfigured(
+                        f"{cls.__name__}.action_policies['{action}'] has unknown keys: {', '.join(sorted(unknown))}.")
+                compiled_policy = compiled.setdefault(action, {"permissions": (), "throttles": ()})
+                compiled_policy["permissions"] += permissions
+                compiled_policy["throttles"] += tuple(policy.get("throttles", ()))
+                for key in ("serializer", "fields", "compiled"):
+                    if key in policy:
+                        if compiled_policy.get(key, policy[key]) != policy[key]:
+                            raise ImproperlyConfigured(
+                                f"{cls.__name__}.action_policies sets '{key}' twice for action '{action}'.")
+                        compiled_policy[key] = policy[key]
+        for action, fields in cls.field_map.items():
+            compiled.setdefault(action, {"permissions": (), "throttles": ()}).setdefault("fields", fields)
+        return compiled
+
+    def get_action_policy(self):
+        return self.compiled_action_policies.get(self.action, {})
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        initkwargs.setdefault("async_dispatch", is_async_enabled())
+        view = super().as_view(actions, **initkwargs)
+        if initkwargs["async_dispatch"]:
+            markcoroutinefunction(view)
+        return view
+
+    def get_permissions(self):
+        return [*super().get_permissions(), *self.get_action_policy().get("permissions", ())]
+
+    def get_throttles(self):
+        return [*super().get_throttles(), *(throttle() for throttle in self.get_action_policy().get("throttles", ()))]
+
+    def get_serializer_class(self):
+        return self.get_action_policy().get("serializer") or super().get_serializer_class()
 
     def get_serializer(self, *args, **kwargs):
-        return super().get_serializer(*args, fields=self.field_map.get(self.action), **kwargs)
+        return super().get_serializer(*args, fields=self.get_action_policy().get("fields"), **kwargs)
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.async_dispatch:
+            return self.adispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            response = await self.ahandle(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        request.accepted_renderer, request.accepted_media_type = self.perform_content_negotiation(request)
+        request.version, request.versioning_scheme = self.determine_version(request, *args, **kwargs)
+        await self.aperform_authentication(request)
+        await self.acheck_permissions(request)
+        await self.acheck_throttles(request)
+
+    async def ahandle(self, request, *args, **kwargs):
+        method = request.method.lower()
+        if method not in self.http_method_names or not hasattr(self, method):
+            return self.http_method_not_allowed(request, *args, **kwargs)
+        handler = getattr(self, f"a{self.action}", None) if self.action else None
+        if handler is None:
+            handler = sync_to_async(getattr(self, method))
+        return await handler(request, *args, **kwargs)
+
+    async def aperform_authentication(self, request):
+        for authenticator in request.authenticators:
+            try:
+                if hasattr(authenticator, "aauthenticate"):
+                    user_auth_tuple = await authenticator.aauthenticate(request)
+                else:
+                    user_auth_tuple = await sync_to_async(authenticator.authenticate)(request)
+            except APIException:
+                request._not_authenticated()
+                raise
+
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+
+        request._not_authenticated()
+
+    def is_async_safe(self, permission):
+        if isinstance(permission, NOT):
+            return self.is_async_safe(permission.op1)
+        if isinstance(permission, (AND, OR)):
+            return self.is_async_safe(permission.op1) and self.is_async_safe(permission.op2)
+        return isinstance(permission, self.async_permission_classes)
+
+    async def acheck_permissions(self, request):
+        if all(map(self.is_async_safe, self.get_permissions())):
+            self.check_permissions(request)
+        else:
+            await sync_to_async(self.check_permissions)(request)
+
+    async def acheck_object_permissions(self, request, obj):
+        if all(map(self.is_async_safe, self.get_permissions())):
+            self.check_object_permissions(request, obj)
+        else:
+            await sync_to_async(self.check_object_permissions)(request, obj)
+
+    async def acheck_throttles(self, request):
+        throttle_durations = []
+        for throttle in self.get_throttles():
+            if hasattr(throttle, "aallow_request"):
+                allowed = await throttle.aallow_request(request, self)
+            else:
+                allowed = await sync_to_async(throttle.allow_request)(request, self)
+            if not allowed:
+                throttle_durations.append(throttle.wait())
+
+        if throttle_durations:
+            durations = [duration for duration in throttle_durations if duration is not None]
+            self.throttled(request, max(durations, default=None))
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        if hasattr(self.paginator, "apaginate_queryset"):
+            return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+        return await sync_to_async(self.paginator.paginate_queryset)(queryset, self.request, view=self)
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+
+        await self.acheck_object_permissions(self.request, obj)
+        return obj
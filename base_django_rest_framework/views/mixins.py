@@ -0,0 +1,53 @@
+from rest_framework.mixins import ListModelMixin as _ListModelMixin
+from rest_framework.response import Response
+
+from base_django_rest_framework.serializers import CompiledSerializer
+
+
+class CompiledListMixin:
+    def get_compiled_serializer(self):
+        if not self.get_action_policy().get("compiled"):
+            return None
+        return CompiledSerializer(self.get_serializer())
+
+
+class ListModelMixin(CompiledListMixin, _ListModelMixin):
+    def list(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = compiled.get_queryset(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(compiled.represent(page))
+
+        return Response(compiled.represent(queryset))
+
+
+class AsyncListModelMixin(CompiledListMixin):
+    async def alist(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        queryset = self.filter_queryset(self.get_queryset())
+        if compiled is not None:
+            queryset = compiled.get_queryset(queryset)
+
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            if compiled is not None:
+                return self.get_paginated_response(compiled.represent(page))
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        if compiled is not None:
+            return Response(compiled.represent([values async for values in queryset]))
+        serializer = self.get_serializer([instance async for instance in queryset], many=True)
+        return Response(serializer.data)
+
+
+class AsyncRetrieveModelMixin:
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
@@ -1,17 +1,23 @@
-from rest_framework.mixins import (ListModelMixin, CreateModelMixin, RetrieveModelMixin, UpdateModelMixin,
-                                   DestroyModelMixin)
+from rest_framework.mixins import CreateModelMixin, RetrieveModelMixin, UpdateModelMixin, DestroyModelMixin
 
 from .generic import GenericViewSet
+from .mixins import ListModelMixin, AsyncListModelMixin, AsyncRetrieveModelMixin
 
 
 class ModelViewSet(ListModelMixin,
+                   AsyncListModelMixin,
                    CreateModelMixin,
                    RetrieveModelMixin,
+                   AsyncRetrieveModelMixin,
                    UpdateModelMixin,
                    DestroyModelMixin,
                    GenericViewSet):
     pass
 
 
-class ReadOnlyModelViewSet(ListModelMixin, RetrieveModelMixin, GenericViewSet):
+class ReadOnlyModelViewSet(ListModelMixin,
+                           AsyncListModelMixin,
+                           RetrieveModelMixin,
+                           AsyncRetrieveModelMixin,
+                           GenericViewSet):
     pass
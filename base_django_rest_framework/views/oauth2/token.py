@@ -1,19 +1,28 @@
 from rest_framework.decorators import action
-from rest_framework.mixins import ListModelMixin, CreateModelMixin
+from rest_framework.mixins import CreateModelMixin
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.status import HTTP_204_NO_CONTENT
 
+from base_django_rest_framework.models import OAuth2Token
 from base_django_rest_framework.oauth2 import server, RevocationEndpoint
 from base_django_rest_framework.serializers import OAuth2TokenSerializer
 from base_django_rest_framework.throttles import CreateOAuth2TokenRateThrottle
 from ..generic import GenericViewSet
+from ..mixins import ListModelMixin, AsyncListModelMixin
 
 
-class OAuth2TokenViewSet(GenericViewSet, ListModelMixin, CreateModelMixin):
+class OAuth2TokenViewSet(GenericViewSet, ListModelMixin, AsyncListModelMixin, CreateModelMixin):
     serializer_class = OAuth2TokenSerializer
+    action_policies = {
+        "create": {"permissions": [~IsAuthenticated], "throttles": [CreateOAuth2TokenRateThrottle]},
+        "list": {"permissions": [IsAuthenticated], "compiled": True},
+        ("revoke", "revoke_all"): {"permissions": [IsAuthenticated]}
+    }
 
     def get_queryset(self):
         if self.request.user:
-            return self.request.user.tokens.all()
+            return OAuth2Token.objects.filter(user=self.request.user.pk, revoked=False).select_related("client")
         return super().get_queryset()
 
     def create(self, request, *args, **kwargs):
@@ -23,21 +32,7 @@ class OAuth2TokenViewSet(GenericViewSet, ListModelMixin, CreateModelMixin):
     def revoke(self, request, *args, **kwargs):
         return server.create_endpoint_response(RevocationEndpoint.ENDPOINT_NAME, request)
 
-    def get_throttles(self):
-        throttles = super().get_throttles()
-
-        if self.action == self.create.__name__:
-            throttles.extend([throttle() for throttle in [CreateOAuth2TokenRateThrottle]])
-
-        return throttles
-
-    def get_permissions(self):
-        permissions = super().get_permissions()
-
-        if self.action == self.create.__name__:
-            permissions.extend([permission() for permission in [~IsAuthenticated]])
-
-        if self.action in (self.list.__name__, self.revoke.__name__):
-            permissions.extend([permission() for permission in [IsAuthenticated]])
-
-        return permissions
+    @action(methods=["post"], detail=False, url_path="revoke/all", url_name="revoke-all")
+    def revoke_all(self, request, *args, **kwargs):
+        OAuth2Token.objects.filter(user=request.user.pk).revoke()
+        return Response(status=HTTP_204_NO_CONTENT)
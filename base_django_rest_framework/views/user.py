@@ -1,10 +1,18 @@
+import posixpath
+from contextlib import contextmanager
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.signing import BadSignature
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.status import HTTP_204_NO_CONTENT
+from rest_framework.status import HTTP_202_ACCEPTED, HTTP_204_NO_CONTENT
 
+from base_django_rest_framework.images import ChunkedUpload, avatar_processor
 from base_django_rest_framework.permissions import (IsSelf, IsSelfOrHasModelPermissions,
                                                     IsNotSelfAndHasModelPermissions, IsNotSelfAndIsSuperuser,
                                                     ModelPermissions)
@@ -23,24 +31,76 @@ class UserViewSet(ModelViewSet):
     lookup_field = "id"
     lookup_url_kwarg = "user"
     lookup_url_converter = "uuid"
-
-    def get_serializer(self, *args, **kwargs):
-        if self.action in (self.update.__name__, self.partial_update.__name__):
-            self.serializer_class = UserUpdateSerializer
-        elif self.action == self.update_email_link.__name__:
-            self.serializer_class = UserUpdateEmailSerializer
-        elif self.action == self.update_active_status.__name__:
-            self.serializer_class = UserUpdateActiveStatusSerializer
-        elif self.action == self.update_admin_status.__name__:
-            self.serializer_class = UserUpdateAdminStatusSerializer
-        elif self.action in (self.update_password.__name__, self.reset_password.__name__):
-            self.serializer_class = UserUpdatePasswordSerializer
-        return super().get_serializer(*args, **kwargs)
+    signature_max_age = 3600
+    action_policies = {
+        "create": {"permissions": [~IsAuthenticated], "throttles": [CreateUserRateThrottle]},
+        "list": {"permissions": [IsAuthenticated, ModelPermissions], "compiled": True},
+        ("retrieve", "destroy"): {"permissions": [IsAuthenticated, IsSelfOrHasModelPermissions]},
+        ("update", "partial_update", "upload_avatar"): {
+            "permissions": [IsAuthenticated, IsSelf],
+            "serializer": UserUpdateSerializer
+        },
+        "update_email_link": {
+            "permissions": [IsAuthenticated],
+            "throttles": [EmailUserRateThrottle],
+            "serializer": UserUpdateEmailSerializer
+        },
+        "verify_email_link": {"permissions": [IsAuthenticated], "throttles": [EmailUserRateThrottle]},
+        "update_active_status": {
+            "permissions": [IsAuthenticated, IsNotSelfAndHasModelPermissions],
+            "serializer": UserUpdateActiveStatusSerializer
+        },
+        "update_admin_status": {
+            "permissions": [IsAuthenticated, IsNotSelfAndIsSuperuser],
+            "serializer": UserUpdateAdminStatusSerializer
+        },
+        "update_password": {"permissions": [IsAuthenticated], "serializer": UserUpdatePasswordSerializer},
+        "reset_password": {"permissions": [~IsAuthenticated], "serializer": UserUpdatePasswordSerializer},
+        "reset_password_link": {"permissions": [~IsAuthenticated], "throttles": [EmailUserRateThrottle]}
+    }
+
+    @staticmethod
+    def get_avatar_upload(user):
+        field = user._meta.get_field("avatar")
+        conf = settings.AVATAR_UPLOAD
+        return ChunkedUpload(
+            field.storage, posixpath.join(field.upload_to, conf["directory"], str(user.pk)), avatar_processor.max_bytes,
+            max_uploads=conf["max_uploads"], max_age=conf["max_age"])
+
+    @action(methods=["put"], detail=True, url_path="avatar", url_name="avatar-upload")
+    def upload_avatar(self, request, *args, **kwargs):
+        user = self.get_object()
+        upload = self.get_avatar_upload(user)
+        try:
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            raise ValidationError("Content-Length must be an integer.")
+        content_range = request.headers.get("Content-Range")
+        if content_range is None:
+            upload_id, file = None, upload.read(request.stream, length, "avatar")
+        else:
+            upload_id, received, total = upload.receive(
+                request.headers.get("Upload-Id"), content_range, request.stream, length)
+            if received < total:
+                headers = {"Upload-Id": upload_id}
+                if received:
+                    headers["Range"] = f"bytes=0-{received - 1}"
+                return Response(status=HTTP_202_ACCEPTED, headers=headers)
+            file = upload.assemble(upload_id, total, "avatar")
+        try:
+            with file, transaction.atomic():
+                serializer = self.get_serializer(user, data={"avatar": file}, partial=True)
+                serializer.is_valid(raise_exception=True)
+                serializer.save()
+        finally:
+            if upload_id is not None:
+                avatar_processor.schedule(upload.discard, upload_id)
+        return Response(serializer.data)
 
     @action(methods=["get"], detail=False, url_path="email/update/<str:signature>", url_name="email-update")
     def update_email(self, request, *args, **kwargs):
-        user, extra = UserSigner.unsign(self.kwargs["signature"], 3600)
-        user.update_email(extra["email"])
+        with self.signed_action() as (user, extra):
+            user.update_email(extra["email"])
         email_changed.send(sender=user.__class__, instance=user)
         return Response(status=HTTP_204_NO_CONTENT)
 
@@ -53,8 +113,8 @@ class UserViewSet(ModelViewSet):
 
     @action(methods=["get"], detail=False, url_path="email/verify/<str:signature>", url_name="email-verify")
     def verify_email(self, request, *args, **kwargs):
-        user, extra = UserSigner.unsign(self.kwargs["signature"], 3600)
-        user.verify(True)
+        with self.signed_action() as (user, extra):
+            user.verify(True)
         return Response(status=HTTP_204_NO_CONTENT)
 
     @action(methods=["get"], detail=False, url_path="email/verify", url_name="email-verify-link")
@@ -81,10 +141,10 @@ class UserViewSet(ModelViewSet):
 
     @action(methods=["post"], detail=False, url_path="password/reset/<str:signature>", url_name="password-reset")
     def reset_password(self, request, *args, **kwargs):
-        user, extra = UserSigner.unsign(self.kwargs["signature"], 3600)
-        serializer = self.get_serializer(instance=user, data=request.data)
-        serializer.is_valid(raise_exception=True)
-        user.update_password(serializer.validated_data["password"])
+        with self.signed_action() as (user, extra):
+            serializer = self.get_serializer(instance=user, data=request.data)
+            serializer.is_valid(raise_exception=True)
+            user.update_password(serializer.validated_data["password"])
         password_changed.send(user.__class__, instance=user)
         return Response(status=HTTP_204_NO_CONTENT)
 
@@ -95,59 +155,21 @@ class UserViewSet(ModelViewSet):
         user.send_password_reset_link()
         return Response(status=HTTP_204_NO_CONTENT)
 
-    def get_throttles(self):
-        throttles = super().get_throttles()
-
-        if self.action == self.create.__name__:
-            throttles.extend([throttle() for throttle in [CreateUserRateThrottle]])
-
-        if self.action in (
-                self.update_email_link.__name__,
-                self.verify_email_link.__name__,
-                self.reset_password_link.__name__):
-            throttles.extend([throttle() for throttle in [EmailUserRateThrottle]])
-
-        return throttles
-
-    def get_permissions(self):
-        permissions = super().get_permissions()
-
-        if self.action == self.create.__name__:
-            permissions.extend([permission() for permission in [~IsAuthenticated]])
-
-        if self.action in (
-                self.list.__name__,
-                self.retrieve.__name__,
-                self.update.__name__,
-                self.partial_update.__name__,
-                self.destroy.__name__,
-                self.update_email_link.__name__,
-                self.verify_email_link.__name__,
-                self.update_password.__name__,
-                self.update_active_status.__name__,
-                self.update_admin_status.__name__):
-            permissions.extend([permission() for permission in [IsAuthenticated]])
-
-        if self.action == self.list.__name__:
-            permissions.extend([permission() for permission in [ModelPermissions]])
-
-        if self.action in (
-                self.update.__name__,
-                self.partial_update.__name__):
-            permissions.extend([permission() for permission in [IsSelf]])
-
-        if self.action in (
-                self.retrieve.__name__,
-                self.destroy.__name__):
-            permissions.extend([permission() for permission in [IsSelfOrHasModelPermissions]])
-
-        if self.action == self.update_active_status.__name__:
-            permissions.extend([permission() for permission in [IsNotSelfAndHasModelPermissions]])
-
-        if self.action == self.update_admin_status.__name__:
-            permissions.extend([permission() for permission in [IsNotSelfAndIsSuperuser]])
-
-        if self.action in (self.reset_password.__name__, self.reset_password_link.__name__):
-            permissions.extend([permission() for permission in [~IsAuthenticated]])
-
-        return permissions
+    def unsign(self):
+        try:
+            return UserSigner.unsign(self.kwargs["signature"], self.signature_max_age, consume=False)
+        except BadSignature:
+            raise PermissionDenied("Invalid, expired or already used signature.")
+
+    @contextmanager
+    def signed_action(self):
+        user, extra = self.unsign()
+        with transaction.atomic():
+            yield user, extra
+            self.consume_signature()
+
+    def consume_signature(self):
+        try:
+            UserSigner.consume(self.kwargs["signature"], self.signature_max_age)
+        except BadSignature:
+            raise PermissionDenied("Invalid, expired or already used signature.")
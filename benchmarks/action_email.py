@@ -0,0 +1,68 @@
+"""
+Compare rendering action emails with ``loader.render_to_string`` against ``ActionEmailRenderer``.
+
+Usage: python benchmarks/action_email.py [--number N] [--recipients N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "example.settings")
+
+import django  # NOQA
+
+django.setup()
+
+from django.template import loader  # NOQA
+
+from base_django_rest_framework.mail import ActionEmailRenderer  # NOQA
+
+CONTEXT = {
+    "theme": "yellow",
+    "title": "Password Reset",
+    "action": "Reset Your Password",
+    "action_text": "Reset Password",
+    "action_link": "https://example.com/password/reset/?signature=signature"
+}
+
+
+def render_to_string(recipients):
+    for user in recipients:
+        context = {**CONTEXT, **user}
+        loader.render_to_string(ActionEmailRenderer.text_template_name, context)
+        loader.render_to_string(ActionEmailRenderer.html_template_name, context)
+
+
+def render(renderer, recipients):
+    for user in recipients:
+        renderer.render({**CONTEXT, **user})
+
+
+def render_many(renderer, recipients):
+    for _ in renderer.render_many(CONTEXT, recipients):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--recipients", type=int, default=100)
+    options = parser.parse_args()
+
+    renderer = ActionEmailRenderer()
+    recipients = [{"user": f"User {i}"} for i in range(options.recipients)]
+    total = options.number * options.recipients
+
+    for name, func in (("render_to_string", lambda: render_to_string(recipients)),
+                       ("ActionEmailRenderer.render", lambda: render(renderer, recipients)),
+                       ("ActionEmailRenderer.render_many", lambda: render_many(renderer, recipients))):
+        best = min(timeit.repeat(func, number=options.number, repeat=5))
+        print(f"{name:<32} {best / total * 1e6:8.1f} us per email")
+
+
+if __name__ == "__main__":
+    main()
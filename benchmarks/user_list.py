@@ -0,0 +1,62 @@
+"""
+Measure a page of users listed through ``UserSerializer`` from model instances against the compiled serializer driven
+from ``values_list()`` rows (the ``"compiled"`` action policy), including the queries.
+
+Runs against a throwaway test database.
+
+Usage: python benchmarks/user_list.py [--users N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "example.settings")
+
+import django  # NOQA
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # NOQA
+from django.db import connection  # NOQA
+from django.test.utils import setup_test_environment  # NOQA
+from rest_framework.request import Request  # NOQA
+from rest_framework.test import APIRequestFactory  # NOQA
+
+from base_django_rest_framework.serializers import UserSerializer, CompiledSerializer  # NOQA
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args()
+
+    setup_test_environment()
+    database = connection.creation.create_test_db(verbosity=0)
+    try:
+        get_user_model().objects.bulk_create(
+            get_user_model()(username=f"user{i}", email=f"user{i}@example.com", first_name="First", last_name="Last",
+                             password="!")
+            for i in range(options.users))
+        context = {"request": Request(APIRequestFactory().get("/users/"))}
+        queryset = get_user_model().objects.all()
+
+        def compiled():
+            serializer = CompiledSerializer(UserSerializer(context=context))
+            return serializer.represent(serializer.get_queryset(queryset))
+
+        assert compiled() == UserSerializer(queryset, many=True, context=context).data
+        for name, func in (("instances", lambda: UserSerializer(queryset.all(), many=True, context=context).data),
+                           ("compiled", compiled)):
+            best = min(timeit.repeat(func, number=1, repeat=options.repeat))
+            print(f"{name:<12} {best * 1e3:9.1f} ms {best / options.users * 1e6:8.1f} us per user")
+    finally:
+        connection.creation.destroy_test_db(database, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
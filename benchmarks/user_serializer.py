@@ -0,0 +1,57 @@
+"""
+Measure serializing users through ``UserSerializer``: one list serializer, a serializer per user, and a serializer per
+user restricted to a field subset (as ``GenericViewSet.get_serializer`` does for actions with ``fields``).
+
+Runs against a throwaway test database.
+
+Usage: python benchmarks/user_serializer.py [--users N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "example.settings")
+
+import django  # NOQA
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # NOQA
+from django.db import connection  # NOQA
+from django.test.utils import setup_test_environment  # NOQA
+
+from base_django_rest_framework.serializers import UserSerializer  # NOQA
+
+FIELDS = ["id", "first_name", "last_name", "username", "email"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args()
+
+    setup_test_environment()
+    database = connection.creation.create_test_db(verbosity=0)
+    try:
+        get_user_model().objects.bulk_create(
+            get_user_model()(username=f"user{i}", email=f"user{i}@example.com", first_name="First", last_name="Last",
+                             password="!")
+            for i in range(options.users))
+        users = list(get_user_model().objects.all())
+
+        for name, func in (("many=True", lambda: UserSerializer(users, many=True).data),
+                           ("per instance", lambda: [UserSerializer(user).data for user in users]),
+                           ("per instance, fields", lambda: [UserSerializer(user, fields=FIELDS).data for user in users])):
+            best = min(timeit.repeat(func, number=1, repeat=options.repeat))
+            print(f"{name:<24} {best * 1e3:9.1f} ms {best / len(users) * 1e6:8.1f} us per user")
+    finally:
+        connection.creation.destroy_test_db(database, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Measure ``UserSigner`` sign/unsign throughput against plain ``signing.dumps``/``loads`` links.
+
+Runs against a throwaway test database and the configured ``USER_SIGNATURE`` cache.
+
+Usage: python benchmarks/user_signer.py [--number N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "example.settings")
+
+import django  # NOQA
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # NOQA
+from django.core.signing import dumps, loads, BadSignature  # NOQA
+from django.db import connection  # NOQA
+from django.test.utils import setup_test_environment  # NOQA
+
+from base_django_rest_framework.signing import UserSigner  # NOQA
+
+
+def legacy_unsign(signature):
+    data = loads(signature, max_age=3600)
+    return get_user_model().objects.get(**data["user"])
+
+
+def replay(signature):
+    try:
+        UserSigner.unsign(signature, 3600)
+    except BadSignature:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=2000)
+    options = parser.parse_args()
+
+    setup_test_environment()
+    database = connection.creation.create_test_db(verbosity=0)
+    try:
+        user = get_user_model().objects.create_user(
+            "bench", "bench@example.com", "Password#123", first_name="Bench", last_name="User")
+        data = {"user": {"id": str(user.id)}, "extra": {}}
+        legacy_signature = dumps(data)
+        signatures = iter([UserSigner.sign(data, user) for _ in range(options.number * 5)])
+        replayed = UserSigner.sign(data, user)
+        UserSigner.unsign(replayed, 3600)
+
+        for name, func in (("dumps", lambda: dumps(data)),
+                           ("UserSigner.sign", lambda: UserSigner.sign(data, user)),
+                           ("loads + objects.get", lambda: legacy_unsign(legacy_signature)),
+                           ("UserSigner.unsign", lambda: UserSigner.unsign(next(signatures), 3600)),
+                           ("UserSigner.unsign (replay)", lambda: replay(replayed))):
+            best = min(timeit.repeat(func, number=options.number, repeat=5))
+            print(f"{name:<28} {options.number / best:10.0f} ops/s {best / options.number * 1e6:8.1f} us/op")
+    finally:
+        connection.creation.destroy_test_db(database, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
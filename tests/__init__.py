@@ -1,9 +1,11 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Permission
+from django.core.cache import cache
 from rest_framework.status import (HTTP_401_UNAUTHORIZED, HTTP_403_FORBIDDEN, HTTP_200_OK, HTTP_204_NO_CONTENT,
-                                   HTTP_201_CREATED)
+                                   HTTP_201_CREATED, HTTP_400_BAD_REQUEST)
 from rest_framework.test import APITestCase
 
+from base_django_rest_framework.caches import token_cache, revocation_list
 from base_django_rest_framework.models import OAuth2Client
 
 
@@ -14,7 +16,12 @@ class TestCase(APITestCase):
     def setUpTestData(cls):
         cls.user = get_user_model().objects.get(username="jane.doe")
         cls.oauth2_client = OAuth2Client.objects.get()
-        cls.oauth2_token = getattr(cls, "user").tokens.filter(revoked=False, is_expired_=False).get()
+        cls.oauth2_token = getattr(cls, "user").tokens.active().get()
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear_local()
+        revocation_list.clear_local()
 
     def setUpAuthentication(self):
         self.client.credentials(HTTP_AUTHORIZATION=f"{self.oauth2_token.token_type} {self.oauth2_token.access_token}")
@@ -40,6 +47,9 @@ class TestCase(APITestCase):
     def assertNoContent(self, response):
         self.assertEqual(response.status_code, HTTP_204_NO_CONTENT)
 
+    def assertBadRequest(self, response):
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
     def _test_list(self, check_authentication=True, check_verification=True, check_permissions=True,
                    permissions=("view",), **kwargs):
         if check_authentication:
@@ -1,9 +1,16 @@
 from io import StringIO
+from unittest.mock import patch
 
+from django.contrib.auth.models import Group
+from django.core.cache import cache
 from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from base_django_rest_framework.caches import CountCache
 from base_django_rest_framework.models import OAuth2Client
+from base_django_rest_framework.pagination import EstimatedCountPagination, EstimatedCountPaginator
 from base_django_rest_framework.views import OAuth2ClientViewSet
 from .. import TestCase
 
@@ -57,6 +64,39 @@ class OAuth2ClientTest(TestCase):
         for client in clients:
             self.check_client(client)
 
+    @patch.object(OAuth2ClientViewSet, "pagination_class", EstimatedCountPagination)
+    def test_estimated_count(self):
+        response_data = self._test_list()
+        self.assertEqual((response_data["count"], response_data["estimated"]), (1, False))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(self.list_url).data["count"], 1)
+        self.assertFalse([query for query in queries if "COUNT(*)" in query["sql"]])
+
+        client = OAuth2Client.objects.get(pk=self.oauth2_client.pk)
+        client.pk, client.client_id, client.client_name = None, "estimated", "estimated"
+        client.save()
+        response_data = self.client.get(self.list_url).data
+        self.assertEqual((response_data["count"], len(response_data["results"])), (2, 2))
+
+        cache.clear()
+        with patch.object(CountCache, "estimate", return_value=250000) as estimate:
+            response_data = self.client.get(self.list_url, {"limit": 1}).data
+            self.assertEqual(self.client.get(self.list_url, {"limit": 1}).data["count"], 250000)
+        estimate.assert_called_once()
+        self.assertEqual((response_data["count"], response_data["estimated"]), (250000, True))
+        cache.clear()
+        with patch.object(CountCache, "estimate", return_value=0):
+            response_data = self.client.get(self.list_url, {"limit": 1, "offset": 1}).data
+        self.assertEqual((response_data["count"], response_data["estimated"], len(response_data["results"])),
+                         (2, False, 1))
+
+        paginator = EstimatedCountPaginator(OAuth2Client.objects.all(), 10)
+        self.assertEqual((paginator.count, paginator.estimated), (2, False))
+
+        with patch.object(CountCache, "invalidate") as invalidate:
+            Group.objects.create(name="estimated")
+        invalidate.assert_not_called()
+
     def test_create(self):
         response_data = self._test_create(self.create_data)
         self.check_client(response_data)
@@ -90,6 +130,14 @@ class OAuth2ClientTest(TestCase):
         self._test_destroy()
         self.assertFalse(OAuth2Client.objects.filter(id=self.oauth2_client.id).exists())
 
+    def test_client_secret_status(self):
+        self.assertFalse(self.oauth2_client.is_client_secret_expired())
+        self.assertEqual(OAuth2Client.objects.client_secret_active().get(), self.oauth2_client)
+        OAuth2Client.objects.update(client_secret_expires_at=1)
+        self.oauth2_client.refresh_from_db()
+        self.assertTrue(self.oauth2_client.is_client_secret_expired())
+        self.assertEqual(OAuth2Client.objects.client_secret_expired().get(), self.oauth2_client)
+
     def test_create_default_client(self):
         self._test_create_default_client()
         self._test_create_default_client(client_name="Client Name")
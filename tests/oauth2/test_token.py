@@ -1,9 +1,24 @@
+import asyncio
+import time
 from io import StringIO
+from unittest import skipIf, skipUnless
+from unittest.mock import patch
 
-from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.core.management import call_command, CommandError
+from django.db import connection, IntegrityError, transaction
+from django.test import AsyncRequestFactory
 from django.urls import reverse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
 
+from base_django_rest_framework.authentication import OAuth2Authentication
+from base_django_rest_framework.caches import OAuth2TokenCache, OAuth2TokenRevocationList, login_guard, token_cache
+from base_django_rest_framework.management.base import TokenCleanupCommand
+from base_django_rest_framework.managers.oauth2.token import OAuth2TokenQuerySet
 from base_django_rest_framework.models import OAuth2Token
+from base_django_rest_framework.utils import signed_token_generator, OAuth2TokenPartitioner
+from base_django_rest_framework.views import OAuth2TokenViewSet
 from .. import TestCase
 
 
@@ -32,21 +47,82 @@ class OAuth2TokenTest(TestCase):
 
         cls.revoke_url = reverse("base_django_rest_framework:oAuth2:tokens:token-revoke")
 
+        cls.revoke_all_url = reverse("base_django_rest_framework:oAuth2:tokens:token-revoke-all")
+
     def test_urls(self):
         self.assertURLEqual(self.list_url, "/oauth2/tokens/")
         self.assertURLEqual(self.revoke_url, "/oauth2/tokens/revoke/")
+        self.assertURLEqual(self.revoke_all_url, "/oauth2/tokens/revoke/all/")
 
     def test_list(self):
         data = self._test_list(check_verification=False, check_permissions=False)
         tokens = data["results"]
-        self.assertEqual(data["count"], 3)
+        self.assertEqual(data["count"], 2)
         for token in tokens:
             self.check_token(token)
 
+    def test_compiled_list(self):
+        self.setUpAuthentication()
+        compiled = self.client.get(self.list_url)
+        self.assertOk(compiled)
+        with patch.object(OAuth2TokenViewSet, "get_compiled_serializer", return_value=None):
+            self.assertEqual(compiled.content, self.client.get(self.list_url).content)
+
     def test_create(self):
         self._test_create(self.create_data, secure=True)
         self._test_create(self.create_data2, secure=True)
-        self.assertFalse(OAuth2Token.objects.filter(id=self.oauth2_token.id).exists())
+        self.assertTrue(OAuth2Token.objects.get(id=self.oauth2_token.id).revoked)
+
+    def test_refresh_token_reuse(self):
+        response = self.client.post(self.list_url, self.create_data2, format="multipart", secure=True)
+        self.assertOk(response)
+        token = OAuth2Token.objects.get(access_token=response.json()["access_token"])
+        self.assertEqual(token.family, self.oauth2_token.family)
+
+        response = self.client.post(self.list_url, self.create_data2, format="multipart", secure=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(OAuth2Token.objects.filter(family=self.oauth2_token.family).exists())
+
+    def test_revoked_family_retention(self):
+        self.assertOk(self.client.post(self.list_url, self.create_data2, format="multipart", secure=True))
+        self.assertFalse(OAuth2Token.objects.filter(id=self.oauth2_token.id).purgeable().exists())
+        call_command("delete_revoked_oauth2_tokens", stdout=StringIO())
+        self.assertTrue(OAuth2Token.objects.get(id=self.oauth2_token.id).revoked)
+        self.client.force_authenticate(self.user)
+        tokens = self.client.get(self.list_url).data["results"]
+        self.assertNotIn(str(self.oauth2_token.id), [token["id"] for token in tokens])
+        self.client.force_authenticate(None)
+
+        with self.settings(OAUTH2_REFRESH_TOKEN_LIFETIME=3600):
+            OAuth2Token.objects.filter(family=self.oauth2_token.family).update(issued_at=0)
+            self.assertTrue(OAuth2Token.objects.filter(id=self.oauth2_token.id).purgeable().exists())
+            data = {**self.create_data2, "refresh_token": OAuth2Token.objects.get(family=self.oauth2_token.family,
+                                                                                  revoked=False).refresh_token}
+            response = self.client.post(self.list_url, data, format="multipart", secure=True)
+            self.assertEqual(response.status_code, 400)
+
+    def test_create_queries(self):
+        with self.assertNumQueries(3):
+            response = self.client.post(self.list_url, self.create_data, format="multipart", secure=True)
+        self.assertOk(response)
+        token = OAuth2Token.objects.get(access_token=response.json()["access_token"])
+        self.assertEqual(response.json()["issued_at"], token.issued_at)
+        self.assertEqual(response.json()["client"]["client_name"], self.oauth2_client.client_name)
+
+    def test_login_guard(self):
+        data = {**self.create_data, "password": "wrong"}
+        with patch.object(login_guard, "username_threshold", 2):
+            for _ in range(2):
+                response = self.client.post(self.list_url, data, format="multipart", secure=True)
+                self.assertEqual(response.status_code, 400)
+            with self.assertNumQueries(0):
+                response = self.client.post(self.list_url, self.create_data, format="multipart", secure=True)
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response["Retry-After"], "1")
+
+        data = {**self.create_data, "username": "unknown"}
+        self.assertEqual(self.client.post(self.list_url, data, format="multipart", secure=True).status_code, 400)
+        self.assertEqual(login_guard.cache.get(login_guard.get_username_key("unknown")), 1)
 
     def test_revoke_access_token(self):
         self._test_revoke(self.oauth2_token.access_token, secure=True)
@@ -56,7 +132,149 @@ class OAuth2TokenTest(TestCase):
         self._test_revoke(self.oauth2_token.refresh_token, secure=True)
         self.assertFalse(OAuth2Token.objects.filter(id=self.oauth2_token.id).exists())
 
+    def test_revoke_all(self):
+        self.assertUnAuthorized(self.client.post(self.revoke_all_url))
+        self.setUpAuthentication()
+        self.assertEqual(self.user.tokens.count(), 3)
+        self.assertNoContent(self.client.post(self.revoke_all_url))
+        self.assertEqual(self.user.tokens.count(), 0)
+        self.assertUnAuthorized(self.client.post(self.revoke_all_url))
+
+    def test_bulk_revoke(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(OAuth2Token.objects.filter(user=self.user).revoke(), 3)
+        self.assertFalse(OAuth2Token.objects.exists())
+
+    async def test_async_list(self):
+        view = OAuth2TokenViewSet.as_view({"get": "list"}, async_dispatch=True)
+        self.assertTrue(asyncio.iscoroutinefunction(view))
+
+        self.assertUnAuthorized(await view(AsyncRequestFactory().get(self.list_url)))
+
+        headers = {"authorization": f"Bearer {self.oauth2_token.access_token}"}
+        response = await view(AsyncRequestFactory().get(self.list_url, headers=headers))
+        self.assertOk(response)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(response.data["results"][0]["client"]["client_id"], self.oauth2_client.client_id)
+
+        response = await view(AsyncRequestFactory().get(self.list_url, headers=headers))
+        self.assertOk(response)
+
+    def test_authenticate_cached_token(self):
+        request = APIRequestFactory().get(self.list_url, HTTP_AUTHORIZATION=f"Bearer {self.oauth2_token.access_token}")
+        authentication = OAuth2Authentication()
+
+        with self.assertNumQueries(1):
+            user, token = authentication.authenticate(request)
+        self.assertEqual(user, self.user)
+
+        with self.assertNumQueries(0):
+            user, token = authentication.authenticate(request)
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertEqual(token.id, self.oauth2_token.id)
+            self.assertFalse(token.is_expired())
+            self.assertFalse(token.is_revoked())
+
+        self._test_revoke(self.oauth2_token.access_token, secure=True)
+        self.assertRaises(AuthenticationFailed, authentication.authenticate, request)
+
+    def test_token_cache_revocation_across_processes(self):
+        access_token = self.oauth2_token.access_token
+        worker, other_worker = OAuth2TokenCache(), OAuth2TokenCache()
+        other_worker.set(self.oauth2_token)
+        self.assertIsNotNone(worker.get(access_token))
+        self.assertIsNotNone(other_worker.get(access_token))
+
+        worker.delete(access_token)
+        self.assertIsNone(other_worker.get(access_token))
+
+        local_worker = OAuth2TokenCache(local_timeout=5)
+        local_worker.set(self.oauth2_token)
+        worker.delete(access_token)
+        self.assertIsNotNone(local_worker.get(access_token))
+
+    def test_authenticate_cached_token_inactive_user(self):
+        request = APIRequestFactory().get(self.list_url, HTTP_AUTHORIZATION=f"Bearer {self.oauth2_token.access_token}")
+        authentication = OAuth2Authentication()
+        authentication.authenticate(request)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertRaises(AuthenticationFailed, authentication.authenticate, request)
+
+    def test_authenticate_signed_token(self):
+        access_token = signed_token_generator(client=self.oauth2_client, grant_type="password", user=self.user,
+                                              scope="")
+        token = OAuth2Token.objects.create(client=self.oauth2_client, user=self.user, token_type="Bearer",
+                                           access_token=access_token, refresh_token="refresh_token",
+                                           expires_in=3600)
+        request = APIRequestFactory().get(self.list_url, HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        authentication = OAuth2Authentication()
+
+        with self.assertNumQueries(1):
+            authentication.authenticate(request)
+        with self.assertNumQueries(0):
+            user, authenticated_token = authentication.authenticate(request)
+            self.assertEqual(user.pk, str(self.user.pk))
+            self.assertEqual(authenticated_token.id, str(token.id))
+            self.assertEqual(authenticated_token.client_id, self.oauth2_client.client_id)
+
+        tampered_token = access_token[:-1] + ("B" if access_token.endswith("A") else "A")
+        tampered = APIRequestFactory().get(self.list_url, HTTP_AUTHORIZATION=f"Bearer {tampered_token}")
+        self.assertRaises(AuthenticationFailed, authentication.authenticate, tampered)
+
+        self._test_revoke(access_token, secure=True)
+        with self.assertNumQueries(0):
+            self.assertRaises(AuthenticationFailed, authentication.authenticate, request)
+
+    def test_authenticate_signed_token_inactive_user(self):
+        access_token = signed_token_generator(client=self.oauth2_client, grant_type="password", user=self.user,
+                                              scope="")
+        OAuth2Token.objects.create(client=self.oauth2_client, user=self.user, token_type="Bearer",
+                                   access_token=access_token, refresh_token="refresh_token", expires_in=3600)
+        request = APIRequestFactory().get(self.list_url, HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        authentication = OAuth2Authentication()
+        authentication.authenticate(request)
+
+        get_user_model().objects.filter(pk=self.user.pk).update(is_active=False)
+        authentication.authenticate(request)
+        token_cache.delete_user(self.user.pk)
+        self.assertRaises(AuthenticationFailed, authentication.authenticate, request)
+
+        get_user_model().objects.filter(pk=self.user.pk).update(is_active=True)
+        token_cache.delete_user(self.user.pk)
+        authentication.authenticate(request)
+        self.user.is_active = False
+        self.user.save()
+        self.assertRaises(AuthenticationFailed, authentication.authenticate, request)
+
+    def test_revocation_list(self):
+        first, second = OAuth2TokenRevocationList(), OAuth2TokenRevocationList()
+        now = int(time.time())
+        first.add(("a", now + 60), ("b", 0), ("expired", now - 1))
+        second.add(("c", now + 60))
+        self.assertEqual([jti in second for jti in ("a", "b", "c", "expired")], [True, True, True, False])
+        self.assertNotIn("d", first)
+        second.add(("d", now + 60))
+        self.assertIn("d", first)
+
+        memoized = OAuth2TokenRevocationList(refresh_interval=60)
+        self.assertNotIn("e", memoized)
+        first.add(("e", now + 60))
+        self.assertNotIn("e", memoized)
+
+    def test_expires_at(self):
+        token = OAuth2Token.objects.create(client=self.oauth2_client, user=self.user, token_type="Bearer",
+                                           access_token="access_token", refresh_token="refresh_token",
+                                           issued_at=100, expires_in=3600)
+        self.assertEqual(token.expires_at, 3700)
+        self.assertTrue(token.is_expired())
+        self.assertFalse(self.oauth2_token.is_expired())
+        self.assertEqual(OAuth2Token.objects.expired().count(), 2)
+        self.assertEqual(self.user.tokens.active().get(), self.oauth2_token)
+
     def test_delete_revoked_tokens(self):
+        self.assertEqual(TokenCleanupCommand().get_queryset().count(), 2)
         out = StringIO()
         call_command("delete_revoked_oauth2_tokens", stdout=out)
         self.assertIn("Successfully deleted 1 tokens.", out.getvalue())
@@ -66,6 +284,83 @@ class OAuth2TokenTest(TestCase):
         call_command("delete_expired_oauth2_tokens", stdout=out)
         self.assertIn("Successfully deleted 1 tokens.", out.getvalue())
 
+    def test_partition_ranges(self):
+        monthly, weekly = OAuth2TokenPartitioner("month"), OAuth2TokenPartitioner("week")
+        self.assertEqual(monthly.get_range(1702000000), (1701388800, 1704067200))
+        self.assertEqual(monthly.get_partition_name(1701388800), f"{monthly.table}_p2023m12")
+        self.assertEqual(weekly.get_range(1702000000), (1701648000, 1702252800))
+        self.assertEqual(weekly.get_partition_name(1701648000), f"{weekly.table}_p2023w49")
+        self.assertRaises(ValueError, OAuth2TokenPartitioner, "day")
+
+    @skipIf(connection.vendor == "postgresql", "Partitioning is supported on PostgreSQL")
+    def test_partition_tokens_unsupported(self):
+        self.assertRaises(CommandError, call_command, "partition_oauth2_tokens", stdout=StringIO())
+
+    @skipUnless(connection.vendor == "postgresql", "Partitioning requires PostgreSQL")
+    def test_partition_tokens(self):
+        OAuth2Token.objects.create(client=self.oauth2_client, user=self.user, token_type="Bearer",
+                                   access_token="access_token", refresh_token="refresh_token",
+                                   issued_at=1702000000, expires_in=3600)
+        OAuth2Token.objects.create(client=self.oauth2_client, user=self.user, token_type="Bearer",
+                                   access_token="rotated_access_token", refresh_token="rotated_refresh_token",
+                                   revoked=True, issued_at=1699000000, expires_in=3600,
+                                   family=self.oauth2_token.family)
+
+        out = StringIO()
+        call_command("partition_oauth2_tokens", convert=True, premake=1, stdout=out)
+        self.assertIn("Successfully converted the oAuth2 token table.", out.getvalue())
+        self.assertIn("Dropped partition base_django_rest_framework_oauth2token_p2023m12.", out.getvalue())
+        self.assertNotIn("p2023m11", out.getvalue())
+
+        partitioner = OAuth2TokenPartitioner()
+        self.assertTrue(partitioner.is_partitioned())
+        self.assertEqual(len(partitioner.get_partitions()), 4)
+        self.assertEqual(OAuth2Token.objects.count(), 4)
+        self.assertEqual(self.user.tokens.active().get(), self.oauth2_token)
+
+        token = OAuth2Token(client=self.oauth2_client, user=self.user, token_type="Bearer",
+                            access_token="rotated_access_token", refresh_token="refresh_token", expires_in=3600)
+        with transaction.atomic():
+            self.assertRaises(IntegrityError, token.save)
+        token.access_token = "access_token"
+        token.save()
+        token.delete()
+        OAuth2Token.objects.create(client=self.oauth2_client, user=self.user, token_type="Bearer",
+                                   access_token="access_token", refresh_token="refresh_token", expires_in=3600)
+        self.assertRaises(CommandError, call_command, "partition_oauth2_tokens", convert=True, stdout=StringIO())
+
+    def test_delete_expired_tokens_in_batches(self):
+        OAuth2Token.objects.bulk_create([
+            OAuth2Token(client=self.oauth2_client, user=self.user, token_type="Bearer", access_token=f"access{i}",
+                        refresh_token=f"refresh{i}", issued_at=0, expires_in=1, expires_at=1)
+            for i in range(4)
+        ])
+
+        out = StringIO()
+        call_command("delete_expired_oauth2_tokens", dry_run=True, stdout=out)
+        self.assertIn("Would delete 5 tokens.", out.getvalue())
+        self.assertEqual(OAuth2Token.objects.expired().count(), 5)
+
+        out = StringIO()
+        call_command("delete_expired_oauth2_tokens", batch_size=2, stdout=out)
+        self.assertIn("Deleted 2 tokens (4 so far).", out.getvalue())
+        self.assertIn("Successfully deleted 5 tokens.", out.getvalue())
+        self.assertFalse(OAuth2Token.objects.expired().exists())
+        self.assertEqual(OAuth2Token.objects.count(), 2)
+
+    def test_delete_expired_tokens_deleted_concurrently(self):
+        delete = OAuth2TokenQuerySet.delete
+
+        def delete_concurrently(queryset):
+            delete(OAuth2Token.objects.expired())
+            return delete(queryset)
+
+        out = StringIO()
+        with patch.object(OAuth2TokenQuerySet, "delete", delete_concurrently):
+            call_command("delete_expired_oauth2_tokens", stdout=out)
+        self.assertIn("Deleted 0 tokens (0 so far).", out.getvalue())
+        self.assertIn("Successfully deleted 0 tokens.", out.getvalue())
+
     def _test_create(self, data, **kwargs):
         self.setUpAuthentication()
         self.assertForbidden(self.client.post(self.list_url, **kwargs))
@@ -0,0 +1,169 @@
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.template import loader
+from django.test import override_settings
+from django.urls import reverse
+
+from base_django_rest_framework.mail import ActionEmailRenderer, outbox_dispatcher
+from base_django_rest_framework.models import OutboxEmail
+from . import TestCase
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError("SMTP server unavailable")
+
+
+class FlakyEmailBackend(locmem.EmailBackend):
+    failures = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.opened = False
+
+    def open(self):
+        self.opened = True
+
+    def close(self):
+        self.opened = False
+
+    def send_messages(self, messages):
+        if not self.opened:
+            raise ConnectionError("Connection closed")
+        if not FlakyEmailBackend.failures:
+            FlakyEmailBackend.failures += 1
+            raise ConnectionError("SMTP server unavailable")
+        return super().send_messages(messages)
+
+
+class ActionEmailRendererTest(TestCase):
+    def test_render(self):
+        renderer = ActionEmailRenderer()
+        context = {"theme": "yellow", "title": "Password Reset", "action": "Reset <Your> Password",
+                   "action_text": "Reset Password", "action_link": "https://example.com/?a=1&b=2"}
+        users = [{"user": "Jane"}, {"user": "John & Co"}, {"user": ""}]
+
+        for (text, html), user in zip(renderer.render_many(context, users), users):
+            self.assertEqual(text, loader.render_to_string(renderer.text_template_name, {**context, **user}))
+            self.assertEqual(html, loader.render_to_string(renderer.html_template_name, {**context, **user}))
+        self.assertEqual(renderer.render({**context, **users[0]}), next(renderer.render_many(context, users[:1])))
+
+    @override_settings(TEMPLATES=[{
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "OPTIONS": {"loaders": [("django.template.loaders.locmem.Loader", {
+            "action.txt": "{% if user %}Hello {{ user }}{% else %}Hello{% endif %}, {{ user|length }}",
+            "action.html": "<p>{{ user|default:'there' }}</p>"
+        })]}
+    }])
+    def test_render_many_branching_template(self):
+        renderer = ActionEmailRenderer()
+        renderer.text_template_name, renderer.html_template_name = "action.txt", "action.html"
+        users = [{"user": "Jane"}, {"user": ""}, {"user": "John & Co"}]
+        self.assertEqual(list(renderer.render_many({}, users)), [
+            ("Hello Jane, 4", "<p>Jane</p>"),
+            ("Hello, 0", "<p>there</p>"),
+            ("Hello John &amp; Co, 9", "<p>John &amp; Co</p>")
+        ])
+
+
+@override_settings(EMAIL_OUTBOX=True)
+class OutboxEmailTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.reset_password_link_url = reverse("base_django_rest_framework:users:user-password-reset-link")
+        cls.reset_password_data = {"email": getattr(cls, "user").email}
+
+    def queue_email(self):
+        self.assertNoContent(self.client.post(self.reset_password_link_url, self.reset_password_data))
+        self.assertTrue(OutboxEmail.objects.pending().exists())
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_send_queued_emails(self):
+        self.queue_email()
+
+        out = StringIO()
+        call_command("send_queued_emails", stdout=out)
+        self.assertIn("Successfully sent 1 emails, 0 retried, 0 failed.", out.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, "Password Reset")
+        self.assertEqual(mail.outbox[0].to, [f"{self.user.get_full_name()} <{self.user.email}>"])
+        self.assertEqual(mail.outbox[0].alternatives[0][1], "text/html")
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_dispatch_queued_email_on_commit(self):
+        with patch.object(outbox_dispatcher, "background", False), self.captureOnCommitCallbacks(execute=True):
+            self.queue_email()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, "Password Reset")
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_claim_queued_emails(self):
+        OutboxEmail.objects.enqueue("Subject", "Message", None, ["jane@example.com"])
+        self.assertEqual(len(OutboxEmail.objects.claim(10, 60)), 1)
+        self.assertEqual(OutboxEmail.objects.claim(10, 60), [])
+        self.assertEqual(outbox_dispatcher.send(*OutboxEmail.objects.values_list("pk", flat=True)), ([], []))
+
+        out = StringIO()
+        call_command("send_queued_emails", stdout=out)
+        self.assertIn("Successfully sent 0 emails, 0 retried, 0 failed.", out.getvalue())
+        self.assertEqual(len(mail.outbox), 0)
+
+    @override_settings(EMAIL_BACKEND="tests.test_email.FailingEmailBackend")
+    def test_send_queued_emails_failure(self):
+        self.queue_email()
+
+        out = StringIO()
+        call_command("send_queued_emails", max_attempts=2, backoff=0, stdout=out)
+        self.assertIn("Successfully sent 0 emails, 1 retried, 0 failed.", out.getvalue())
+        self.assertEqual(OutboxEmail.objects.due().get().attempts, 1)
+
+        out = StringIO()
+        call_command("send_queued_emails", max_attempts=2, backoff=0, stdout=out)
+        self.assertIn("Successfully sent 0 emails, 0 retried, 1 failed.", out.getvalue())
+
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.Status.FAILED)
+        self.assertEqual(email.attempts, 2)
+        self.assertEqual(email.last_error, "SMTP server unavailable")
+        self.assertFalse(OutboxEmail.objects.due().exists())
+
+    @override_settings(EMAIL_BACKEND="tests.test_email.FlakyEmailBackend")
+    def test_send_queued_emails_reconnects(self):
+        FlakyEmailBackend.failures = 0
+        for recipient in ("jane@example.com", "john@example.com"):
+            OutboxEmail.objects.enqueue("Subject", "Message", None, [recipient])
+
+        out = StringIO()
+        call_command("send_queued_emails", backoff=0, stdout=out)
+        self.assertIn("Successfully sent 1 emails, 1 retried, 0 failed.", out.getvalue())
+        self.assertEqual(mail.outbox[0].to, ["john@example.com"])
+
+
+class AnnouncementTest(TestCase):
+    options = {"subject": "Announcement", "action": "Read Our News", "action_text": "Read News",
+               "action_link": "https://example.com/news/"}
+
+    def test_send_announcement(self):
+        out = StringIO()
+        call_command("send_announcement", dry_run=True, stdout=out, **self.options)
+        self.assertIn("Would email 2 users.", out.getvalue())
+
+        with tempfile.TemporaryDirectory() as checkpoint:
+            out = StringIO()
+            call_command("send_announcement", chunk_size=1, checkpoint=checkpoint, stdout=out, **self.options)
+            self.assertIn("Successfully emailed 2 users.", out.getvalue())
+            self.assertEqual(len(mail.outbox), 2)
+            self.assertEqual({message.subject for message in mail.outbox}, {"Announcement"})
+            self.assertIn(f"Hello {self.user.get_short_name()},", "".join(message.body for message in mail.outbox))
+
+            out = StringIO()
+            call_command("send_announcement", checkpoint=checkpoint, stdout=out, **self.options)
+            self.assertIn("Successfully emailed 0 users.", out.getvalue())
+            self.assertEqual(len(mail.outbox), 2)
@@ -1,16 +1,53 @@
-from io import BytesIO
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from io import BytesIO, StringIO
+from unittest import skipUnless
+from unittest.mock import patch
 from urllib.parse import urlparse
 
+import redis
 from PIL import Image
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, Permission
 from django.core import mail
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.files import File
 from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.signing import BadSignature
+from django.db import connection, DatabaseError
+from django.test import AsyncRequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.status import (HTTP_202_ACCEPTED, HTTP_404_NOT_FOUND, HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                                   HTTP_429_TOO_MANY_REQUESTS)
+
+from base_django_rest_framework.exceptions import ServiceUnavailable
+from base_django_rest_framework.hashers import PasswordHashingExecutor
+from base_django_rest_framework.images import AvatarProcessor, avatar_processor
+from base_django_rest_framework.pagination import KeysetPagination
+from base_django_rest_framework.serializers import UserSerializer, UserUpdateSerializer
+from base_django_rest_framework.signing import UserSigner
+from base_django_rest_framework.throttles import CreateUserRateThrottle, SlidingWindowRateThrottle
 from base_django_rest_framework.views import UserViewSet
 from . import TestCase
 
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/15")
+
+
+def redis_available():
+    try:
+        return redis.Redis.from_url(REDIS_URL, socket_connect_timeout=1).ping()
+    except redis.RedisError:
+        return False
+
 
 class UserTest(TestCase):
     @classmethod
@@ -73,6 +110,15 @@ class UserTest(TestCase):
             kwargs={UserViewSet.lookup_url_kwarg: getattr(cls, "user2").id}
         )
 
+        cls.upload_avatar_url = reverse(
+            "base_django_rest_framework:users:user-avatar-upload",
+            kwargs={UserViewSet.lookup_url_kwarg: getattr(cls, "user").id}
+        )
+        cls.upload_avatar_url2 = reverse(
+            "base_django_rest_framework:users:user-avatar-upload",
+            kwargs={UserViewSet.lookup_url_kwarg: getattr(cls, "user2").id}
+        )
+
         cls.update_email_link_url = reverse("base_django_rest_framework:users:user-email-update-link")
         cls.update_email_url = reverse("base_django_rest_framework:users:user-email-update",
                                        kwargs={"signature": getattr(cls, "user").get_signature(
@@ -107,7 +153,7 @@ class UserTest(TestCase):
 
     @classmethod
     def _get_avatar(cls, name):
-        image = Image.new("RGB", size=(100, 100), color=(0, 0, 0))
+        image = Image.new("RGB", size=(100, 100), color=tuple(hashlib.sha256(name.encode()).digest()[:3]))
         file = BytesIO()
         file.name = name
         image.save(file)
@@ -128,10 +174,91 @@ class UserTest(TestCase):
         self._test_create(self.create_data, check_authentication=False, check_verification=False,
                           check_permissions=False, format="multipart")
 
+    def test_permission_cache(self):
+        self._test_list()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertOk(self.client.get(self.list_url))
+        self.assertFalse([query for query in queries if "auth_permission" in query["sql"]])
+
+        self.user.user_permissions.clear()
+        self.assertForbidden(self.client.get(self.list_url))
+        group = Group.objects.create(name="viewers")
+        self.user.groups.add(group)
+        group.permissions.add(Permission.objects.get(codename="view_user"))
+        self.assertOk(self.client.get(self.list_url))
+
+    def test_action_policies(self):
+        view = UserViewSet(action="update")
+        self.assertIs(view.get_serializer_class(), UserUpdateSerializer)
+        self.assertEqual(view.get_permissions()[-2:], UserViewSet(action="partial_update").get_permissions()[-2:])
+        self.assertIs(UserViewSet(action="retrieve").get_permissions()[-1],
+                      UserViewSet(action="destroy").get_permissions()[-1])
+
+        with self.assertRaisesMessage(ImproperlyConfigured, "unknown action 'missing'"):
+            type("InvalidViewSet", (UserViewSet,), {"action_policies": {"missing": {"permissions": [IsAuthenticated]}}})
+
+    def test_serializer_field_subsets(self):
+        serializer = UserSerializer(self.user, fields=["id", "email"])
+        self.assertIs(type(serializer), type(UserSerializer(self.user2, fields=("email", "id"))))
+        self.assertTrue(issubclass(type(serializer), UserSerializer))
+        self.assertEqual(serializer.data, {"id": str(self.user.id), "email": self.user.email})
+        self.assertNotIn("password", UserUpdateSerializer(self.user).fields)
+        self.assertEqual(list(UserSerializer([self.user], many=True, fields=["id"]).data), [{"id": str(self.user.id)}])
+
+    def test_compiled_list(self):
+        self._test_list()
+        file = self._get_avatar("avatar_compiled.png")
+        self.user2.avatar.save(file.name, file)
+        compiled = self.client.get(self.list_url)
+        self.assertOk(compiled)
+        with patch.object(UserViewSet, "get_compiled_serializer", return_value=None):
+            self.assertEqual(compiled.content, self.client.get(self.list_url).content)
+        users = {user["id"]: user for user in compiled.data["results"]}
+        self.assertIn("http://testserver/media/users/avatars/", users[str(self.user2.id)]["avatar"])
+        with self.captureAvatarTasks():
+            self.user2.delete()
+
+    @patch.object(UserViewSet, "pagination_class", KeysetPagination)
+    def test_keyset_pagination(self):
+        self._test_list()
+        created_at = self.user.created_at
+        get_user_model().objects.bulk_create(
+            get_user_model()(username=f"user{i}", email=f"user{i}@example.com", password="!", created_at=created_at)
+            for i in range(5))
+        expected = get_user_model().objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        expected = [str(pk) for pk in expected]
+
+        for compiled in (True, False):
+            with patch.object(UserViewSet, "get_compiled_serializer",
+                              UserViewSet.get_compiled_serializer if compiled else lambda view: None):
+                pages, url = [], self.list_url + "?limit=2&count=true"
+                while url:
+                    response_data = self.client.get(url).data
+                    self.assertEqual(response_data["count"], len(expected))
+                    pages.append(response_data)
+                    url = response_data["next"]
+                self.assertEqual([user["id"] for page in pages for user in page["results"]], expected)
+                self.assertIsNone(pages[0]["previous"])
+                self.assertEqual(self.client.get(pages[-1]["previous"]).data["results"], pages[-2]["results"])
+
+        self.assertNotIn("count", self.client.get(self.list_url).data)
+        self.assertEqual(self.client.get(self.list_url, {"cursor": "invalid"}).status_code, HTTP_404_NOT_FOUND)
+
     def test_retrieve_self(self):
         response_data = self._test_retrieve(check_verification=False, check_permissions=False)
         self.check_user(response_data)
 
+    async def test_async_retrieve(self):
+        view = UserViewSet.as_view({"get": "retrieve"}, async_dispatch=True)
+        headers = {"authorization": f"Bearer {self.oauth2_token.access_token}"}
+
+        response = await view(AsyncRequestFactory().get(self.detail_url, headers=headers), user=self.user.id)
+        self.assertOk(response)
+        self.assertEqual(response.data["id"], str(self.user.id))
+
+        response = await view(AsyncRequestFactory().get(self.detail_url2, headers=headers), user=self.user2.id)
+        self.assertForbidden(response)
+
     def test_retrieve(self):
         self.detail_url = self.detail_url2
         response_data = self._test_retrieve()
@@ -170,16 +297,17 @@ class UserTest(TestCase):
             "first_name": self.user.first_name,
         }, {key: value for key, value in self.partial_update_data.items() if key != "avatar"})
 
-        response_data2 = self._test_partial_update(self.partial_update_data2, check_authentication=False,
-                                                   check_verification=False,
-                                                   check_permissions=False,
-                                                   format="multipart")
+        with self.captureAvatarTasks():
+            response_data2 = self._test_partial_update(self.partial_update_data2, check_authentication=False,
+                                                       check_verification=False,
+                                                       check_permissions=False,
+                                                       format="multipart")
         self.assertFalse(default_storage.exists(avatar_name))
         self.check_user(response_data2)
         self.user.refresh_from_db()
         avatar_name2 = self.check_avatar(response_data2.pop("avatar"))
         self.assertEqual(self.user.avatar.name, avatar_name2)
-        default_storage.delete(avatar_name2)
+        avatar_processor.delete(default_storage, avatar_name2)
 
     def test_partial_update(self):
         self.detail_url = self.detail_url2
@@ -197,7 +325,8 @@ class UserTest(TestCase):
         self.user2.avatar.save(file.name, file, True)
         self.assertTrue(default_storage.exists(self.user2.avatar.name))
         self.detail_url = self.detail_url2
-        self._test_destroy()
+        with self.captureAvatarTasks():
+            self._test_destroy()
         self.assertFalse(get_user_model().objects.filter(id=self.user2.id).exists())
         self.assertFalse(default_storage.exists(self.user2.avatar.name))
 
@@ -315,6 +444,201 @@ class UserTest(TestCase):
         self.assertTrue(self.user.check_password(self.reset_password_data2["password"]))
         self.assertEqual(self.user.tokens.count(), 0)
 
+    def test_single_use_signature(self):
+        with patch.object(get_user_model(), "verify", side_effect=DatabaseError("unavailable")):
+            self.assertRaises(DatabaseError, self.client.get, self.verify_email_url)
+        self.assertNoContent(self.client.get(self.verify_email_url))
+        with self.assertNumQueries(0):
+            self.assertForbidden(self.client.get(self.verify_email_url))
+
+        self.assertBadRequest(self.client.post(self.reset_password_url, {"password": "short"}))
+        self.assertNoContent(self.client.post(self.reset_password_url, self.reset_password_data2))
+        self.assertForbidden(self.client.post(self.reset_password_url, self.reset_password_data2))
+
+        signature = self.user.get_signature()
+        self.user.refresh_from_db()
+        self.user.update_password("Password#123.stale")
+        self.assertRaises(BadSignature, UserSigner.unsign, signature, 3600)
+
+    def test_sliding_window_throttle(self):
+        request = AsyncRequestFactory().post(self.list_url, REMOTE_ADDR="10.0.0.1")
+        request.user = None
+        view = UserViewSet()
+        now = [600.0]
+
+        def hits(count):
+            throttle = CreateUserRateThrottle()
+            throttle.rate, throttle.timer = "3/minute", lambda: now[0]
+            throttle.num_requests, throttle.duration = throttle.parse_rate(throttle.rate)
+            return [throttle.allow_request(request, view) for _ in range(count)], throttle
+
+        allowed, throttle = hits(4)
+        self.assertEqual(allowed, [True, True, True, False])
+        self.assertEqual(throttle.wait(), 60)
+        now[0] += 90
+        allowed, throttle = hits(3)
+        self.assertEqual(allowed, [True, True, False])
+        self.assertAlmostEqual(throttle.wait(), 10)
+
+        self.assertIsNone(CreateUserRateThrottle().get_redis_script())
+        with self.settings(THROTTLE={"cache": "default", "redis_url": "redis://localhost:6379/15", "scopes": {}}):
+            script = CreateUserRateThrottle().get_redis_script()
+            self.assertIs(CreateUserRateThrottle().get_redis_script(), script)
+
+    @skipUnless(redis_available(), "Requires a Redis server at REDIS_URL")
+    def test_sliding_window_throttle_redis(self):
+        request = AsyncRequestFactory().post(self.list_url, REMOTE_ADDR="10.0.0.2")
+        request.user = None
+        view = UserViewSet()
+        now = time.time()
+        caches_setting = {**settings.CACHES, "throttle": {"BACKEND": "django.core.cache.backends.redis.RedisCache",
+                                                          "LOCATION": REDIS_URL}}
+
+        with self.settings(CACHES=caches_setting, THROTTLE={"cache": "throttle", "redis_url": None, "scopes": {}}):
+            caches["throttle"].clear()
+            throttles = [CreateUserRateThrottle() for _ in range(4)]
+            for throttle in throttles:
+                throttle.rate, throttle.timer = "3/minute", lambda: now
+                throttle.num_requests, throttle.duration = throttle.parse_rate(throttle.rate)
+            script = throttles[0].get_redis_script()
+            self.assertIsNotNone(script)
+            with patch.object(SlidingWindowRateThrottle, "hit_cache") as hit_cache:
+                allowed = [throttle.allow_request(request, view) for throttle in throttles]
+            hit_cache.assert_not_called()
+            self.assertEqual(allowed, [True, True, True, False])
+            self.assertIs(throttles[-1].get_redis_script(), script)
+            caches["throttle"].clear()
+
+    def test_dirty_fields(self):
+        user = get_user_model().objects.get(id=self.user.id)
+        self.assertEqual(user.get_dirty_fields(), {})
+
+        user.first_name = "Janet"
+        self.assertEqual(user.get_dirty_fields(), {"first_name": "Jane"})
+
+        with self.assertNumQueries(1) as queries:
+            user.save()
+        self.assertTrue(queries.captured_queries[0]["sql"].startswith("UPDATE"))
+        self.assertNotIn('"last_name"', queries.captured_queries[0]["sql"])
+        self.assertEqual(user.get_dirty_fields(), {})
+
+        with self.assertNumQueries(1):
+            user.verify(True)
+        user.refresh_from_db()
+        self.assertEqual((user.first_name, user.is_verified), ("Janet", True))
+
+    def test_avatar_variants(self):
+        self.setUpAuthentication()
+        with self.captureOnCommitCallbacks() as callbacks:
+            response_data = self.client.patch(self.detail_url, self.partial_update_data2, format="multipart").data
+        self.assertEqual(len(callbacks), 1)
+        self.user.refresh_from_db()
+        self.assertRegex(self.user.avatar.name, r"^users/avatars/[0-9a-f]{64}\.png$")
+        self.assertEqual(list(response_data["avatar_variants"]), ["64", "256", "512"])
+
+        processor = AvatarProcessor(background=False)
+        variants = processor.process(default_storage, self.user.avatar.name)
+        self.assertEqual(len(variants), 6)
+        self.assertEqual(processor.process(default_storage, self.user.avatar.name), [])
+        with default_storage.open(processor.get_variant_names(self.user.avatar.name)[256]["webp"]) as file:
+            self.assertEqual(Image.open(file).size, (256, 256))
+
+        file = self._get_avatar("avatar_partial_update2.png")
+        self.user2.avatar.save(file.name, file)
+        self.assertEqual(self.user2.avatar.name, self.user.avatar.name)
+        with self.captureAvatarTasks():
+            self.user2.delete()
+        self.assertTrue(default_storage.exists(self.user.avatar.name))
+        with self.captureAvatarTasks():
+            self.user.delete()
+        self.assertFalse(default_storage.exists(self.user.avatar.name))
+        self.assertFalse(any(default_storage.exists(variant) for variant in variants))
+
+        processor = AvatarProcessor(max_pixels=100 * 99)
+        self.assertRaisesMessage(ValidationError, "pixels", processor.validate, File(self._get_avatar("avatar.png")))
+        processor = AvatarProcessor(max_bytes=10)
+        self.assertRaisesMessage(ValidationError, "bytes", processor.validate, File(self._get_avatar("avatar.png")))
+
+    def test_upload_avatar(self):
+        data = self._get_avatar("avatar_upload.png").getvalue()
+        self.assertUnAuthorized(self.client.put(self.upload_avatar_url, data, content_type="image/png"))
+        self.setUpAuthentication()
+        self.assertForbidden(self.client.put(self.upload_avatar_url2, data, content_type="image/png"))
+        with patch.object(avatar_processor, "max_bytes", len(data) - 1):
+            response = self.client.put(self.upload_avatar_url, data, content_type="image/png")
+            self.assertEqual(response.status_code, HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        def put_chunk(start, end, upload_id=None):
+            headers = {"HTTP_CONTENT_RANGE": f"bytes {start}-{end}/{len(data)}" if end else f"bytes */{len(data)}"}
+            if upload_id is not None:
+                headers["HTTP_UPLOAD_ID"] = upload_id
+            return self.client.put(self.upload_avatar_url, data[start:end + 1 if end else 0],
+                                   content_type="application/octet-stream", **headers)
+
+        response = put_chunk(0, 99)
+        self.assertEqual(response.status_code, HTTP_202_ACCEPTED)
+        upload_id = response["Upload-Id"]
+        for retry in (put_chunk(0, 99, upload_id), put_chunk(None, None, upload_id)):
+            self.assertEqual(retry.status_code, HTTP_202_ACCEPTED)
+            self.assertEqual(retry["Range"], "bytes=0-99")
+        with self.captureAvatarTasks():
+            self.assertOk(put_chunk(100, len(data) - 1, upload_id))
+        self.user.refresh_from_db()
+        self.assertRegex(self.user.avatar.name, r"^users/avatars/[0-9a-f]{64}\.png$")
+        self.assertFalse(default_storage.exists(f"users/avatars/uploads/{self.user.id}/{upload_id}"))
+
+        old_avatar = self.user.avatar.name
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.put(self.upload_avatar_url, self._get_avatar("avatar.png").getvalue(),
+                                       content_type="image/png")
+        self.assertOk(response)
+        self.assertTrue(default_storage.exists(old_avatar))
+        with patch.object(avatar_processor, "background", False):
+            for callback in callbacks:
+                callback()
+        self.assertFalse(default_storage.exists(old_avatar))
+        self.user.refresh_from_db()
+        avatar_processor.delete(default_storage, self.user.avatar.name)
+
+    def test_avatar_upload_limits(self):
+        self.setUpAuthentication()
+        headers = {"HTTP_CONTENT_RANGE": "bytes 0-9/100"}
+        response = self.client.put(self.upload_avatar_url, b"0" * 10, content_type="application/octet-stream",
+                                   CONTENT_LENGTH="ten", **headers)
+        self.assertBadRequest(response)
+
+        for _ in range(settings.AVATAR_UPLOAD["max_uploads"]):
+            response = self.client.put(self.upload_avatar_url, b"0" * 10, content_type="application/octet-stream",
+                                       **headers)
+            self.assertEqual(response.status_code, HTTP_202_ACCEPTED)
+        response = self.client.put(self.upload_avatar_url, b"0" * 10, content_type="application/octet-stream",
+                                   **headers)
+        self.assertEqual(response.status_code, HTTP_429_TOO_MANY_REQUESTS)
+
+        out = StringIO()
+        call_command("delete_stale_avatar_uploads", stdout=out)
+        self.assertIn("Successfully deleted 0 stale uploads.", out.getvalue())
+        out = StringIO()
+        call_command("delete_stale_avatar_uploads", max_age=-1, stdout=out)
+        self.assertIn(f"Successfully deleted {settings.AVATAR_UPLOAD['max_uploads']} stale uploads.", out.getvalue())
+        self.assertFalse(default_storage.exists(f"users/avatars/uploads/{self.user.id}"))
+
+    def test_password_hashing_executor(self):
+        executor = PasswordHashingExecutor(workers=1, queue_size=0)
+        started, release = threading.Event(), threading.Event()
+        thread = threading.Thread(target=executor.run, args=(lambda: started.set() or release.wait(),))
+        thread.start()
+        started.wait()
+        self.assertRaises(ServiceUnavailable, executor.make_password, "password")
+        release.set()
+        thread.join()
+
+        self.assertTrue(executor.check_password("password", make_password("password")))
+        self.assertFalse(executor.check_password("password", make_password(None)))
+        stats = executor.stats()
+        self.assertEqual((stats["submitted"], stats["completed"], stats["rejected"]), (2, 2, 1))
+        self.assertEqual((stats["in_flight"], stats["peak_in_flight"]), (0, 1))
+
     def _test_create(self, data, **kwargs):
         self.setUpAuthentication()
         self.assertForbidden(self.client.post(self.list_url, **kwargs))
@@ -323,6 +647,7 @@ class UserTest(TestCase):
         response_data = super()._test_create(data, **kwargs)
         self.check_user(response_data)
         avatar_name = self.check_avatar(response_data.pop("avatar"))
+        response_data.pop("avatar_variants")
         response_data.update({"avatar": avatar_name})
         user_query = get_user_model().objects.filter(**response_data)
         self.assertTrue(user_query.exists())
@@ -338,6 +663,7 @@ class UserTest(TestCase):
         self.assertEqual(list(user.keys()), [
             "id",
             "avatar",
+            "avatar_variants",
             "first_name",
             "last_name",
             "username",
@@ -350,6 +676,11 @@ class UserTest(TestCase):
             "updated_at"
         ])
 
+    @contextmanager
+    def captureAvatarTasks(self):
+        with patch.object(avatar_processor, "background", False), self.captureOnCommitCallbacks(execute=True):
+            yield
+
     def check_avatar(self, avatar):
         media_path = urlparse(settings.MEDIA_URL).path.strip("/")
         avatar_path = urlparse(avatar).path.strip("/")